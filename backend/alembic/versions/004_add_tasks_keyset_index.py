@@ -0,0 +1,34 @@
+"""Add composite index for keyset pagination of tasks
+
+Revision ID: 004_add_tasks_keyset_index
+Revises: 003_add_users_table
+Create Date: 2026-10-18 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision: str = '004_add_tasks_keyset_index'
+down_revision: Union[str, None] = '003_add_users_table'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Composite index matching ORDER BY created_at DESC, id DESC so each page
+    # of GET /api/v1/tasks is a bounded index range scan
+    op.create_index(
+        'ix_tasks_created_at_id',
+        'tasks',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    # Drop the keyset pagination index
+    op.drop_index('ix_tasks_created_at_id', table_name='tasks')
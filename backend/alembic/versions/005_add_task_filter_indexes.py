@@ -0,0 +1,67 @@
+"""Add indexes for task list filters and sort keys
+
+Revision ID: 005_add_task_filter_indexes
+Revises: 004_add_tasks_keyset_index
+Create Date: 2026-10-18 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision: str = '005_add_task_filter_indexes'
+down_revision: Union[str, None] = '004_add_tasks_keyset_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Filter on completed / priority while keeping the default sort order
+    op.create_index(
+        'ix_tasks_completed_created_at_id',
+        'tasks',
+        ['completed', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False
+    )
+    op.create_index(
+        'ix_tasks_priority_created_at_id',
+        'tasks',
+        ['priority', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False
+    )
+
+    # Partial index for the common "open tasks by priority" views
+    op.create_index(
+        'ix_tasks_open_priority_created_at_id',
+        'tasks',
+        ['priority', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+        postgresql_where=sa.text('completed = false')
+    )
+
+    # updated_since filter and the updated_at / title sort keys
+    op.create_index(
+        'ix_tasks_updated_at_id',
+        'tasks',
+        [sa.text('updated_at DESC'), sa.text('id DESC')],
+        unique=False
+    )
+    op.create_index('ix_tasks_title_id', 'tasks', ['title', 'id'], unique=False)
+
+    # The single-column completed index is a prefix of the composite one above
+    op.drop_index('ix_tasks_completed', table_name='tasks')
+
+
+def downgrade() -> None:
+    # Restore the single-column completed index
+    op.create_index('ix_tasks_completed', 'tasks', ['completed'], unique=False)
+
+    # Drop the filter and sort indexes
+    op.drop_index('ix_tasks_title_id', table_name='tasks')
+    op.drop_index('ix_tasks_updated_at_id', table_name='tasks')
+    op.drop_index('ix_tasks_open_priority_created_at_id', table_name='tasks')
+    op.drop_index('ix_tasks_priority_created_at_id', table_name='tasks')
+    op.drop_index('ix_tasks_completed_created_at_id', table_name='tasks')
@@ -0,0 +1,40 @@
+"""Add revoked_tokens table
+
+Revision ID: 006_add_revoked_tokens_table
+Revises: 005_add_task_filter_indexes
+Create Date: 2026-10-18 12:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision: str = '006_add_revoked_tokens_table'
+down_revision: Union[str, None] = '005_add_task_filter_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create the revoked_tokens table used for signout
+    op.create_table(
+        'revoked_tokens',
+        sa.Column('jti', sa.String(length=64), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('jti')
+    )
+
+    # Create indexes
+    op.create_index(op.f('ix_revoked_tokens_expires_at'), 'revoked_tokens', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    # Drop indexes
+    op.drop_index(op.f('ix_revoked_tokens_expires_at'), table_name='revoked_tokens')
+
+    # Drop the revoked_tokens table
+    op.drop_table('revoked_tokens')
@@ -0,0 +1,42 @@
+"""Add full-text and trigram search over tasks
+
+Revision ID: 007_add_task_search
+Revises: 006_add_revoked_tokens_table
+Create Date: 2026-10-18 13:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers
+revision: str = '007_add_task_search'
+down_revision: Union[str, None] = '006_add_revoked_tokens_table'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Trigram matching for typo-tolerant title search
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Weighted tsvector over title (A) and description (B), maintained by Postgres
+    op.execute(
+        "ALTER TABLE tasks ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')) STORED"
+    )
+
+    # Create indexes
+    op.execute("CREATE INDEX ix_tasks_search_vector ON tasks USING gin (search_vector)")
+    op.execute("CREATE INDEX ix_tasks_title_trgm ON tasks USING gin (title gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    # Drop indexes
+    op.drop_index('ix_tasks_title_trgm', table_name='tasks')
+    op.drop_index('ix_tasks_search_vector', table_name='tasks')
+
+    # Drop the generated column; the pg_trgm extension is left installed
+    op.drop_column('tasks', 'search_vector')
@@ -0,0 +1,28 @@
+"""Add functional index on lower(title)
+
+Revision ID: 008_add_tasks_lower_title_index
+Revises: 007_add_task_search
+Create Date: 2026-10-18 14:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision: str = '008_add_tasks_lower_title_index'
+down_revision: Union[str, None] = '007_add_task_search'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Case-insensitive title lookups used by the chat agent
+    op.create_index('ix_tasks_lower_title', 'tasks', [sa.text('lower(title)')], unique=False)
+
+
+def downgrade() -> None:
+    # Drop the functional index
+    op.drop_index('ix_tasks_lower_title', table_name='tasks')
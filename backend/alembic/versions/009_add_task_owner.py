@@ -0,0 +1,117 @@
+"""Add task ownership and tenant-scoped indexes
+
+Revision ID: 009_add_task_owner
+Revises: 008_add_tasks_lower_title_index
+Create Date: 2026-10-18 15:00:00
+
+"""
+import os
+import uuid
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers
+revision: str = '009_add_task_owner'
+down_revision: Union[str, None] = '008_add_tasks_lower_title_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (old global index, new user-leading index, columns after user_id, partial index predicate)
+_INDEXES = [
+    ('ix_tasks_created_at_id', 'ix_tasks_user_created_at_id',
+     [sa.text('created_at DESC'), sa.text('id DESC')], None),
+    ('ix_tasks_completed_created_at_id', 'ix_tasks_user_completed_created_at_id',
+     ['completed', sa.text('created_at DESC'), sa.text('id DESC')], None),
+    ('ix_tasks_priority_created_at_id', 'ix_tasks_user_priority_created_at_id',
+     ['priority', sa.text('created_at DESC'), sa.text('id DESC')], None),
+    ('ix_tasks_open_priority_created_at_id', 'ix_tasks_user_open_priority_created_at_id',
+     ['priority', sa.text('created_at DESC'), sa.text('id DESC')], 'completed = false'),
+    ('ix_tasks_updated_at_id', 'ix_tasks_user_updated_at_id',
+     [sa.text('updated_at DESC'), sa.text('id DESC')], None),
+    ('ix_tasks_title_id', 'ix_tasks_user_title_id', ['title', 'id'], None),
+    ('ix_tasks_lower_title', 'ix_tasks_user_lower_title', [sa.text('lower(title)')], None),
+]
+
+
+def _task_owner(connection, orphans: int) -> uuid.UUID:
+    """The user to give ownerless tasks to; never guessed when there are several"""
+    requested = context.get_x_argument(as_dictionary=True).get("task_owner") or os.getenv("TASK_OWNER_ID")
+    if requested:
+        try:
+            owner_id = uuid.UUID(requested)
+        except ValueError:
+            raise RuntimeError(f"task_owner must be a user id, got {requested!r}") from None
+        exists = connection.execute(
+            sa.text("SELECT 1 FROM users WHERE id = :owner_id"), {"owner_id": str(owner_id)}
+        ).scalar()
+        if not exists:
+            raise RuntimeError(f"task_owner {owner_id} is not a user")
+        return owner_id
+
+    users = connection.execute(sa.text("SELECT id FROM users LIMIT 2")).scalars().all()
+    if len(users) == 1:
+        return users[0]
+    if not users:
+        raise RuntimeError(
+            f"{orphans} tasks have no owner and there are no users to assign them to; "
+            "create a user first or delete the tasks"
+        )
+    raise RuntimeError(
+        f"{orphans} tasks have no owner and there are several users; choose who gets them with "
+        "`alembic -x task_owner=<user id> upgrade head` (or set TASK_OWNER_ID), or delete the tasks"
+    )
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=True))
+
+    # Existing tasks predate ownership; they go to the account named by
+    # `-x task_owner=<user id>` (or TASK_OWNER_ID), or to the only user
+    connection = op.get_bind()
+    orphans = connection.execute(sa.text("SELECT count(*) FROM tasks WHERE user_id IS NULL")).scalar()
+    if orphans:
+        owner_id = _task_owner(connection, orphans)
+        connection.execute(
+            sa.text("UPDATE tasks SET user_id = :owner_id WHERE user_id IS NULL"),
+            {"owner_id": owner_id},
+        )
+
+    op.alter_column('tasks', 'user_id', nullable=False)
+    op.create_foreign_key(
+        'fk_tasks_user_id_users', 'tasks', 'users', ['user_id'], ['id'], ondelete='CASCADE'
+    )
+
+    # Lead every list index with user_id so a user's queries only scan their
+    # own rows. The global versions would only serve cross-user scans, which
+    # nothing issues any more.
+    for old_name, new_name, columns, where in _INDEXES:
+        op.create_index(
+            new_name,
+            'tasks',
+            ['user_id'] + columns,
+            unique=False,
+            postgresql_where=sa.text(where) if where else None
+        )
+        op.drop_index(old_name, table_name='tasks')
+
+
+def downgrade() -> None:
+    # Restore the global indexes
+    for old_name, new_name, columns, where in reversed(_INDEXES):
+        op.create_index(
+            old_name,
+            'tasks',
+            columns,
+            unique=False,
+            postgresql_where=sa.text(where) if where else None
+        )
+        op.drop_index(new_name, table_name='tasks')
+
+    # Drop the owner column; tasks become shared again
+    op.drop_constraint('fk_tasks_user_id_users', 'tasks', type_='foreignkey')
+    op.drop_column('tasks', 'user_id')
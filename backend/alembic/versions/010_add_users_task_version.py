@@ -0,0 +1,31 @@
+"""Add task list version counter to users
+
+Revision ID: 010_add_users_task_version
+Revises: 009_add_task_owner
+Create Date: 2026-10-18 16:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision: str = '010_add_users_task_version'
+down_revision: Union[str, None] = '009_add_task_owner'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Bumped with every task write; part of the task list ETag
+    op.add_column(
+        'users',
+        sa.Column('task_version', sa.BigInteger(), nullable=False, server_default='0')
+    )
+
+
+def downgrade() -> None:
+    # Drop the counter
+    op.drop_column('users', 'task_version')
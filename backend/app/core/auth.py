@@ -0,0 +1,105 @@
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.settings import settings
+from app.core.tokens import decode_access_token
+from app.db.database import get_async_session
+from app.repositories.token_repository import TokenRepository
+from app.repositories.user_repository import UserRepository
+from app.utils.cache import TTLCache
+from app.utils.exceptions import InvalidTokenException
+
+
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """The caller behind a verified access token"""
+    id: UUID
+    email: str
+    username: str
+    is_active: bool
+    token_id: str
+    token_expires_at: int
+
+
+# Verified tokens keyed by the raw token string. A hit skips signature checks
+# and database lookups entirely; the TTL bounds how stale revocation and
+# account status can be on other replicas.
+_verified_tokens: TTLCache[AuthenticatedUser] = TTLCache(
+    max_entries=settings.auth_cache_max_entries,
+    ttl_seconds=settings.auth_cache_ttl_seconds,
+)
+
+_bearer = HTTPBearer(auto_error=False)
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def authenticate_token(token: str, db_session: AsyncSession) -> AuthenticatedUser:
+    """Resolve an access token to its user, using the verified-token cache"""
+    cached = _verified_tokens.get(token)
+    if cached is not None:
+        if cached.token_expires_at <= time.time():
+            _verified_tokens.delete(token)
+            raise InvalidTokenException("Token has expired")
+        return cached
+
+    claims = decode_access_token(token)
+    if await TokenRepository(db_session).is_revoked(claims["jti"]):
+        raise InvalidTokenException("Token has been revoked")
+
+    user = await UserRepository(db_session).get_user_by_id(UUID(claims["sub"]))
+    if not user:
+        raise InvalidTokenException("User no longer exists")
+
+    authenticated = AuthenticatedUser(
+        id=user.id,
+        email=user.email,
+        username=user.username,
+        is_active=bool(user.is_active),
+        token_id=claims["jti"],
+        token_expires_at=claims["exp"],
+    )
+    _verified_tokens.set(token, authenticated, ttl_seconds=claims["exp"] - time.time())
+    return authenticated
+
+
+async def revoke_token(token: str, db_session: AsyncSession) -> None:
+    """Revoke an access token everywhere and drop it from the local cache"""
+    claims = decode_access_token(token)
+    expires_at = datetime.fromtimestamp(claims["exp"], tz=timezone.utc)
+    await TokenRepository(db_session).revoke(claims["jti"], expires_at)
+    _verified_tokens.delete(token)
+
+
+async def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer),
+    db_session: AsyncSession = Depends(get_async_session),
+) -> AuthenticatedUser:
+    """Dependency requiring a valid bearer access token"""
+    if credentials is None or credentials.scheme.lower() != "bearer":
+        raise _unauthorized("Not authenticated")
+    try:
+        user = await authenticate_token(credentials.credentials, db_session)
+    except InvalidTokenException as e:
+        raise _unauthorized(e.message)
+    if not user.is_active:
+        raise _unauthorized("Account is deactivated")
+    return user
+
+
+def get_auth_cache_stats() -> dict:
+    """Hit/miss statistics for the verified-token cache"""
+    return _verified_tokens.stats()
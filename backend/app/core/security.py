@@ -0,0 +1,45 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple, TypeVar
+
+from passlib.context import CryptContext
+
+from app.core.settings import settings
+
+T = TypeVar("T")
+
+# Using argon2 as it's more reliable than bcrypt in some environments
+pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+
+# argon2-cffi releases the GIL while hashing, so a small thread pool gives real
+# parallelism without blocking the event loop. The pool size bounds how many
+# hashes run at once; extra requests queue instead of piling onto the CPU.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers,
+    thread_name_prefix="password-hash",
+)
+
+
+async def _run_in_hash_pool(func: Callable[..., T], *args) -> T:
+    """Run a CPU-bound password function on the hashing pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, func, *args)
+
+
+async def hash_password(password: str) -> str:
+    """Hash a password off the event loop"""
+    return await _run_in_hash_pool(pwd_context.hash, password)
+
+
+async def verify_password(password: str, password_hash: str) -> bool:
+    """Verify a password against a stored hash off the event loop"""
+    return await _run_in_hash_pool(pwd_context.verify, password, password_hash)
+
+
+async def verify_and_update_password(password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password and, if the hash uses outdated parameters, rehash it.
+
+    Returns ``(valid, new_hash)`` where ``new_hash`` is None unless the stored
+    hash should be replaced.
+    """
+    return await _run_in_hash_pool(pwd_context.verify_and_update, password, password_hash)
@@ -8,8 +8,79 @@ class Settings(BaseSettings):
     log_level: str = "info"
     gemini_api_key: Optional[str] = None
 
+    # Database engine and connection pool
+    db_echo: bool = False
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    # asyncpg prepared statement cache; None means "auto": disabled when the
+    # URL points at a PgBouncer/Neon pooler endpoint, asyncpg's default otherwise
+    db_statement_cache_size: Optional[int] = None
+
+    # Number of threads used for Argon2 password hashing and verification
+    password_hash_workers: int = 4
+
+    # Access tokens issued at signin
+    auth_secret_key: Optional[str] = None
+    access_token_ttl_seconds: int = 3600
+    # In-process cache of verified tokens; bounds how long a revocation or
+    # deactivation made on another replica can go unnoticed
+    auth_cache_ttl_seconds: int = 60
+    auth_cache_max_entries: int = 10000
+
+    # Read-through cache of task reads. Writes invalidate it locally and, on
+    # Postgres, on every other replica via LISTEN/NOTIFY; the TTL bounds
+    # staleness if a notification is ever lost. LISTEN needs a direct
+    # connection, so set task_cache_listen_url when DATABASE_URL is a pooler.
+    task_cache_enabled: bool = True
+    task_cache_ttl_seconds: float = 30.0
+    task_cache_max_entries: int = 10000
+    task_cache_max_bytes: int = 64 * 1024 * 1024
+    task_cache_listen_url: Optional[str] = None
+
+    # "gemini", or "fake" for a deterministic offline stand-in (benchmarks, CI)
+    llm_backend: str = "gemini"
+    llm_fake_latency_ms: float = 50.0
+    llm_fake_latency_distribution: str = "constant"  # constant, uniform, exponential, lognormal
+    llm_fake_chunk_delay_ms: float = 5.0
+    llm_fake_error_rate: float = 0.0
+    llm_fake_seed: int = 0
+
+    # Gemini call limits; calls beyond llm_max_concurrency queue for at most
+    # llm_queue_timeout_seconds, and the circuit opens after
+    # llm_circuit_failure_threshold consecutive timeouts/5xx/429s
+    gemini_api_endpoint: Optional[str] = None
+    llm_max_concurrency: int = 8
+    llm_queue_timeout_seconds: float = 2.0
+    llm_request_timeout_seconds: float = 20.0
+    llm_max_retries: int = 2
+    llm_retry_base_delay_seconds: float = 0.5
+    llm_circuit_failure_threshold: int = 5
+    llm_circuit_reset_seconds: float = 30.0
+
+    # Task context sent with chat prompts: the most relevant tasks (BM25 over
+    # titles/descriptions plus recency) within a token budget
+    llm_context_max_tokens: int = 1000
+    llm_context_max_tasks: int = 50
+    llm_context_recency_half_life_hours: float = 72.0
+    llm_context_refresh_seconds: float = 5.0
+    llm_context_resync_seconds: int = 300
+    # Users whose task index is kept in memory (least recently used are dropped)
+    llm_context_max_users: int = 1000
+
+    # Resolve plain chat commands locally instead of asking Gemini
+    chat_fast_path_enabled: bool = True
+
+    # Chat (Gemini) response cache; set llm_cache_path to add an on-disk SQLite tier
+    llm_cache_enabled: bool = True
+    llm_cache_ttl_seconds: int = 300
+    llm_cache_max_entries: int = 1024
+    llm_cache_path: Optional[str] = None
+
     class Config:
         env_file = ".env"
 
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
@@ -0,0 +1,77 @@
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+import time
+import uuid
+from typing import Any, Dict, Tuple
+
+from app.core.settings import settings
+from app.utils.exceptions import InvalidTokenException
+
+logger = logging.getLogger(__name__)
+
+# Compact HS256 JWTs signed with the app secret. Verification is a single
+# HMAC, so it costs microseconds rather than an Argon2 run.
+_HEADER = {"alg": "HS256", "typ": "JWT"}
+
+if settings.auth_secret_key:
+    _secret = settings.auth_secret_key.encode()
+else:
+    # Tokens signed with a per-process key don't survive restarts and aren't
+    # accepted by other replicas; fine for development only
+    logger.warning("AUTH_SECRET_KEY is not set; using a random per-process signing key")
+    _secret = secrets.token_bytes(32)
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(signing_input: bytes) -> bytes:
+    return hmac.new(_secret, signing_input, hashlib.sha256).digest()
+
+
+_ENCODED_HEADER = _b64encode(json.dumps(_HEADER, separators=(",", ":")).encode())
+
+
+def create_access_token(user_id: uuid.UUID) -> Tuple[str, Dict[str, Any]]:
+    """Issue a signed access token for a user, returning (token, claims)"""
+    now = int(time.time())
+    claims = {
+        "sub": str(user_id),
+        "jti": uuid.uuid4().hex,
+        "iat": now,
+        "exp": now + settings.access_token_ttl_seconds,
+        "type": "access",
+    }
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+    signing_input = f"{_ENCODED_HEADER}.{payload}"
+    signature = _b64encode(_sign(signing_input.encode()))
+    return f"{signing_input}.{signature}", claims
+
+
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """Verify a token's signature and expiry and return its claims"""
+    try:
+        header, payload, signature = token.split(".")
+        expected = _sign(f"{header}.{payload}".encode())
+        if header != _ENCODED_HEADER or not hmac.compare_digest(expected, _b64decode(signature)):
+            raise InvalidTokenException("Invalid token signature")
+        claims = json.loads(_b64decode(payload))
+        if claims.get("type") != "access" or "sub" not in claims or "jti" not in claims:
+            raise InvalidTokenException("Malformed token")
+    except InvalidTokenException:
+        raise
+    except (ValueError, TypeError, AttributeError) as e:
+        raise InvalidTokenException("Malformed token") from e
+
+    if claims.get("exp", 0) <= time.time():
+        raise InvalidTokenException("Token has expired")
+    return claims
@@ -1,18 +1,49 @@
+from datetime import timezone
 from sqlalchemy import Column, DateTime, func
+from sqlalchemy.dialects.sqlite import DATETIME as SQLITE_DATETIME
 from sqlalchemy.ext.declarative import declared_attr
+from sqlalchemy.types import TypeDecorator
 from app.db.database import Base
 
+# CURRENT_TIMESTAMP, which func.now() compiles to on SQLite
+_SQLITE_TIMESTAMP_FORMAT = "%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+
+
+class Timestamp(TypeDecorator):
+    """DateTime(timezone=True) that compares correctly on SQLite.
+
+    SQLite keeps timestamps as text and compares them as strings. Server-side
+    func.now() writes 'YYYY-MM-DD HH:MM:SS' in UTC, while SQLAlchemy binds a
+    datetime as 'YYYY-MM-DD HH:MM:SS.ffffff' with any UTC offset dropped, so a
+    bound value never equals a stored one and aware values from other zones
+    are off by their offset. On SQLite, bind values are converted to UTC and
+    written in the stored format; other databases use DateTime unchanged.
+    """
+
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(SQLITE_DATETIME(storage_format=_SQLITE_TIMESTAMP_FORMAT))
+        return dialect.type_descriptor(DateTime(timezone=True))
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and dialect.name == "sqlite" and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
 
 class TimestampMixin:
     """Mixin class to add created_at and updated_at timestamps to models"""
 
     @declared_attr
     def created_at(cls):
-        return Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+        return Column(Timestamp(), server_default=func.now(), nullable=False)
 
     @declared_attr
     def updated_at(cls):
-        return Column(DateTime(timezone=True), server_default=func.now(),
+        return Column(Timestamp(), server_default=func.now(),
                      onupdate=func.now(), nullable=False)
 
 
@@ -21,8 +52,8 @@ class BaseModel(Base):
     __abstract__ = True
 
     # Include the timestamp mixin
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(),
+    created_at = Column(Timestamp(), server_default=func.now(), nullable=False)
+    updated_at = Column(Timestamp(), server_default=func.now(),
                        onupdate=func.now(), nullable=False)
 
 
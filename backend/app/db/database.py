@@ -1,16 +1,75 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
-from app.core.settings import settings
-import os
+from app.core.settings import Settings, settings
+from typing import Any, Dict
+from uuid import uuid4
 
 # =========================
 # DATABASE ENGINE (ASYNC)
+# =========================
 
 # Use database URL from settings
 DATABASE_URL = settings.database_url
 
+
+def _uses_transaction_pooler(url) -> bool:
+    """Whether the URL points at a PgBouncer-style pooler (e.g. Neon's -pooler host)"""
+    host = url.host or ""
+    return "-pooler" in host or "pgbouncer" in host or url.port == 6432
+
+
+def _asyncpg_connect_args(url, config: Settings) -> Dict[str, Any]:
+    """asyncpg connect arguments, disabling prepared statement caching behind a pooler"""
+    cache_size = config.db_statement_cache_size
+    if cache_size is None:
+        cache_size = 0 if _uses_transaction_pooler(url) else 100
+    if cache_size > 0:
+        return {"statement_cache_size": cache_size}
+
+    # In transaction pooling mode a prepared statement may land on a different
+    # server connection, so turn off both asyncpg's and SQLAlchemy's caches and
+    # give every statement a unique name to avoid "already exists" collisions
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+    }
+
+
+def create_engine_from_settings(config: Settings = settings) -> AsyncEngine:
+    """Build the application's async engine from Settings"""
+    url = make_url(config.database_url)
+    engine_args: Dict[str, Any] = {"echo": config.db_echo}
+
+    if url.get_backend_name() == "postgresql":
+        engine_args.update(
+            pool_size=config.db_pool_size,
+            max_overflow=config.db_max_overflow,
+            pool_timeout=config.db_pool_timeout,
+            pool_recycle=config.db_pool_recycle,
+            pool_pre_ping=config.db_pool_pre_ping,
+        )
+        if url.get_driver_name() == "asyncpg":
+            engine_args["connect_args"] = _asyncpg_connect_args(url, config)
+
+    return create_async_engine(url, **engine_args)
+
+
 # Configuration for database engine
-engine = create_async_engine(DATABASE_URL, echo=True)
+engine = create_engine_from_settings(settings)
+
+
+def get_pool_status() -> Dict[str, Any]:
+    """Snapshot of the engine's connection pool usage"""
+    pool = engine.pool
+    status: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        stat = getattr(pool, name, None)
+        if callable(stat):
+            status[name] = stat()
+    return status
+
 # =========================
 # ASYNC SESSION
 # =========================
@@ -10,7 +10,9 @@ from app.routers import tasks
 from app.routers.auth import router as auth_router
 from app.routers.chat import router as chat_router
 import uvicorn
-from app.db.database import engine
+from app.db.database import engine, get_pool_status
+from app.repositories.task_cache import task_cache, task_cache_listener
+from app.routers.tasks import task_list_flights
 from app.db.base import Base
 
 # Import all models to ensure they are registered with SQLAlchemy
@@ -30,6 +32,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Link", "X-Next-Cursor", "X-Prev-Cursor", "ETag"],
 )
 
 # Include the tasks router
@@ -48,6 +51,14 @@ async def startup_event():
     async with engine.begin() as conn:
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
+    if task_cache_listener is not None:
+        await task_cache_listener.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if task_cache_listener is not None:
+        await task_cache_listener.stop()
 
 @app.get("/")
 def read_root():
@@ -57,6 +68,14 @@ def read_root():
 def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/db")
+def database_pool_status():
+    return {"status": "healthy", "pool": get_pool_status()}
+
+@app.get("/health/cache")
+def task_cache_status():
+    return {"status": "healthy", "task_cache": task_cache.stats(), "task_list_single_flight": task_list_flights.stats()}
+
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
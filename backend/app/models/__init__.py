@@ -1,4 +1,5 @@
 from .task import Task
 from .user import User
+from .revoked_token import RevokedToken
 
-__all__ = ["Task", "User"]
\ No newline at end of file
+__all__ = ["Task", "User", "RevokedToken"]
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, DateTime, func
+from app.db.database import Base
+
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    # Token id (the JWT "jti" claim); rows can be purged once expires_at passes
+    jti = Column(String(64), primary_key=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
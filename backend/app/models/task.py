@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, Text
+from sqlalchemy import Column, String, Boolean, Text, ForeignKey, Index, DDL, event, func
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import BaseModel
 import uuid
@@ -12,4 +12,63 @@ class Task(BaseModel):
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     completed = Column(Boolean, nullable=False, default=False)
-    priority = Column(String(20), nullable=False, default='medium')
\ No newline at end of file
+    priority = Column(String(20), nullable=False, default='medium')
+    # Every task belongs to exactly one user; all queries are scoped by it
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+
+
+# Every list index leads with user_id, so a user's queries range-scan only
+# their own rows no matter how large the table grows.
+
+# Composite index backing keyset pagination on (created_at DESC, id DESC)
+Index("ix_tasks_user_created_at_id", Task.user_id, Task.created_at.desc(), Task.id.desc())
+
+# Indexes backing the server-side filters and sort keys of the task list
+Index("ix_tasks_user_completed_created_at_id", Task.user_id, Task.completed, Task.created_at.desc(), Task.id.desc())
+Index("ix_tasks_user_priority_created_at_id", Task.user_id, Task.priority, Task.created_at.desc(), Task.id.desc())
+Index("ix_tasks_user_updated_at_id", Task.user_id, Task.updated_at.desc(), Task.id.desc())
+Index("ix_tasks_user_title_id", Task.user_id, Task.title, Task.id)
+
+# Case-insensitive exact title lookups (TaskRepository.find_by_title)
+Index("ix_tasks_user_lower_title", Task.user_id, func.lower(Task.title))
+Index(
+    "ix_tasks_user_open_priority_created_at_id",
+    Task.user_id,
+    Task.priority,
+    Task.created_at.desc(),
+    Task.id.desc(),
+    postgresql_where=Task.completed.is_(False),
+    sqlite_where=Task.completed.is_(False),
+)
+
+
+# Full-text search. The tsvector column is generated by PostgreSQL and isn't
+# mapped on the model; SQLite gets an FTS5 index kept in sync by triggers.
+# Migration 007 creates the same objects for databases managed by Alembic.
+_SEARCH_DDL = {
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')) STORED",
+        "CREATE INDEX IF NOT EXISTS ix_tasks_search_vector ON tasks USING gin (search_vector)",
+        "CREATE INDEX IF NOT EXISTS ix_tasks_title_trgm ON tasks USING gin (title gin_trgm_ops)",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+        "title, description, content='tasks', content_rowid='rowid', tokenize='porter unicode61')",
+        "CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN "
+        "INSERT INTO tasks_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description); END",
+        "CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN "
+        "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+        "VALUES ('delete', old.rowid, old.title, old.description); END",
+        "CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE ON tasks BEGIN "
+        "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+        "VALUES ('delete', old.rowid, old.title, old.description); "
+        "INSERT INTO tasks_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description); END",
+    ],
+}
+
+for _dialect, _statements in _SEARCH_DDL.items():
+    for _statement in _statements:
+        event.listen(Task.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
@@ -1,12 +1,9 @@
-from sqlalchemy import Column, String, Boolean
+from sqlalchemy import Column, String, Boolean, BigInteger
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import BaseModel
-from passlib.context import CryptContext
+from app.core.security import pwd_context
 import uuid
 
-# Using argon2 as it's more reliable than bcrypt in some environments
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
-
 
 class User(BaseModel):
     __tablename__ = "users"
@@ -17,11 +14,15 @@ class User(BaseModel):
     username = Column(String(255), unique=True, nullable=False, index=True)
     password_hash = Column(String(255), nullable=False)
     is_active = Column(Boolean, default=True)
+    # Bumped by every write to this user's tasks. With max(updated_at) and the
+    # task count it versions their task list for ETags; it also catches
+    # deletions, which leave no row behind, and edits within one timestamp tick
+    task_version = Column(BigInteger, nullable=False, default=0, server_default="0")
 
     def set_password(self, password: str):
-        """Hash and set the user's password"""
+        """Hash and set the user's password (blocking; use app.core.security in async code)"""
         self.password_hash = pwd_context.hash(password)
 
     def verify_password(self, password: str) -> bool:
-        """Verify a password against the stored hash"""
+        """Verify a password against the stored hash (blocking; use app.core.security in async code)"""
         return pwd_context.verify(password, self.password_hash)
\ No newline at end of file
@@ -0,0 +1,367 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.settings import settings
+from app.db.database import _uses_transaction_pooler
+from app.repositories.task_repository import TaskRepository
+from app.schemas.task import TaskFilter, TaskResponse, task_responses
+from app.utils.pagination import DEFAULT_SORT
+
+logger = logging.getLogger(__name__)
+
+# Postgres channel carrying "<replica id>:<owner id>" after every committed task write
+INVALIDATION_CHANNEL = "task_cache_invalidate"
+
+# Rough in-memory footprint of a cached TaskResponse besides its text fields
+_TASK_OVERHEAD_BYTES = 600
+_ENTRY_OVERHEAD_BYTES = 200
+
+_MISSING = object()
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate bytes held by a cached read result"""
+    if isinstance(value, list):
+        return _ENTRY_OVERHEAD_BYTES + sum(_estimate_size(item) for item in value)
+    if isinstance(value, TaskResponse):
+        return _TASK_OVERHEAD_BYTES + len(value.title) + len(value.description or "")
+    return _ENTRY_OVERHEAD_BYTES
+
+
+class TaskReadCache:
+    """
+    Bounded LRU cache of task reads, grouped by owner
+
+    Entries expire after ``ttl_seconds`` and the least recently used ones are
+    evicted beyond ``max_entries`` or ``max_bytes``. A write drops every entry
+    of its owner. A read that started before an invalidation of its owner,
+    or before the last clear(), is not stored, so a slow read can't put
+    pre-write data back.
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024, ttl_seconds: float = 30.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        # (owner, key) -> (expires_at, size, value)
+        self._entries: "OrderedDict[Tuple[UUID, Hashable], Tuple[float, int, Any]]" = OrderedDict()
+        self._owner_keys: Dict[UUID, Set[Hashable]] = {}
+        self._invalidated_at: Dict[UUID, float] = {}
+        self._cleared_at = float("-inf")
+        self._lock = Lock()
+        self.bytes = 0
+        # False while cross-replica invalidations can't be received
+        self.available = True
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.remote_invalidations = 0
+        self.stale_fills = 0
+
+    def get(self, owner_id: UUID, key: Hashable) -> Any:
+        """The cached value, or _MISSING"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((owner_id, key)) if self.available else None
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    self._remove(owner_id, key)
+                self.misses += 1
+                return _MISSING
+            self._entries.move_to_end((owner_id, key))
+            self.hits += 1
+            return entry[2]
+
+    def set(self, owner_id: UUID, key: Hashable, value: Any, read_started: float) -> None:
+        """Store a value read from the database at read_started (time.monotonic())"""
+        now = time.monotonic()
+        with self._lock:
+            if not self.available or now - read_started >= self.ttl_seconds:
+                return
+            if max(self._invalidated_at.get(owner_id, -1.0), self._cleared_at) >= read_started:
+                # The owner's tasks changed (or invalidations may have been
+                # missed) while this read was in flight
+                self.stale_fills += 1
+                return
+            self._remove(owner_id, key)
+            size = _estimate_size(value)
+            self._entries[(owner_id, key)] = (now + self.ttl_seconds, size, value)
+            self._owner_keys.setdefault(owner_id, set()).add(key)
+            self.bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+                (evicted_owner, evicted_key), _ = next(iter(self._entries.items()))
+                self._remove(evicted_owner, evicted_key)
+                self.evictions += 1
+
+    def _remove(self, owner_id: UUID, key: Hashable) -> None:
+        entry = self._entries.pop((owner_id, key), None)
+        if entry is None:
+            return
+        self.bytes -= entry[1]
+        keys = self._owner_keys.get(owner_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._owner_keys[owner_id]
+
+    def invalidate(self, owner_id: UUID, remote: bool = False) -> None:
+        """Drop every cached read of an owner"""
+        now = time.monotonic()
+        with self._lock:
+            for key in list(self._owner_keys.get(owner_id, ())):
+                self._remove(owner_id, key)
+            self._invalidated_at[owner_id] = now
+            if remote:
+                self.remote_invalidations += 1
+            else:
+                self.invalidations += 1
+            if len(self._invalidated_at) > self.max_entries:
+                # Reads older than the TTL are never stored, so older marks can go
+                horizon = now - self.ttl_seconds
+                self._invalidated_at = {
+                    owner: at for owner, at in self._invalidated_at.items() if at >= horizon
+                }
+
+    def clear(self) -> None:
+        """Drop everything, e.g. after invalidations may have been missed"""
+        now = time.monotonic()
+        with self._lock:
+            # Applies to every owner, including ones with nothing cached yet
+            self._cleared_at = now
+            self._entries.clear()
+            self._owner_keys.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit ratio, size and invalidation counters"""
+        lookups = self.hits + self.misses
+        return {
+            "available": self.available,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "owners": len(self._owner_keys),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "remote_invalidations": self.remote_invalidations,
+            "stale_fills": self.stale_fills,
+        }
+
+
+class CachedTaskRepository(TaskRepository):
+    """
+    TaskRepository with read-through caching of the hot reads
+
+    get_task_by_id, get_all_tasks and get_tasks_page are served from the
+    TaskReadCache. Cached rows are TaskResponse snapshots, which TaskService
+    passes through unchanged. Every write publishes an invalidation in its
+    own transaction (delivered to other replicas only if it commits) and
+    drops the owner's entries locally once committed.
+
+    get_version is never cached, and cached lists are keyed by the version
+    read before them. A list is therefore never served under a newer version
+    than it was read at, even if an invalidation was missed, so the list
+    ETag can't pin a stale page.
+    """
+
+    def __init__(self, db_session: AsyncSession, owner_id: UUID, cache: TaskReadCache, replica_id: str):
+        super().__init__(db_session, owner_id)
+        self.cache = cache
+        self.replica_id = replica_id
+        self._version: Optional[Tuple[Any, ...]] = None
+
+    async def _read_through(self, key: Hashable, load: Callable[[], Any], snapshot: Callable[[Any], Any]) -> Any:
+        value = self.cache.get(self.owner_id, key)
+        if value is not _MISSING:
+            return value
+        started = time.monotonic()
+        value = snapshot(await load())
+        self.cache.set(self.owner_id, key, value, started)
+        return value
+
+    @staticmethod
+    def _snapshot_task(db_task) -> Optional[TaskResponse]:
+        return TaskResponse.model_validate(db_task) if db_task is not None else None
+
+    @staticmethod
+    def _snapshot_tasks(db_tasks) -> List[TaskResponse]:
+        return task_responses(db_tasks)
+
+    async def get_task_by_id(self, task_id: UUID):
+        return await self._read_through(
+            ("task", task_id), lambda: super(CachedTaskRepository, self).get_task_by_id(task_id), self._snapshot_task
+        )
+
+    async def _list_version(self) -> Tuple[Any, ...]:
+        """The owner's task version, read once per repository until its next write"""
+        if self._version is None:
+            await self.get_version()
+        return self._version
+
+    async def get_all_tasks(self, filters: Optional[TaskFilter] = None, sort: str = DEFAULT_SORT):
+        key = ("all", await self._list_version(), filters.model_dump_json() if filters else None, sort)
+        return await self._read_through(
+            key, lambda: super(CachedTaskRepository, self).get_all_tasks(filters, sort), self._snapshot_tasks
+        )
+
+    async def get_tasks_page(self, limit, filters=None, sort=DEFAULT_SORT, after=None, before=None):
+        key = ("page", await self._list_version(), limit, filters.model_dump_json() if filters else None, sort, after, before)
+        return await self._read_through(
+            key,
+            lambda: super(CachedTaskRepository, self).get_tasks_page(limit, filters, sort, after=after, before=before),
+            self._snapshot_tasks,
+        )
+
+    async def get_version(self):
+        self._version = await super().get_version()
+        return self._version
+
+    async def _commit_write(self, changed: bool = True) -> None:
+        if changed and self.db_session.get_bind().dialect.name == "postgresql":
+            # NOTIFY is transactional: other replicas only hear about committed writes
+            payload = f"{self.replica_id}:{self.owner_id}"
+            await self.db_session.execute(select(func.pg_notify(INVALIDATION_CHANNEL, payload)))
+        try:
+            await super()._commit_write(changed)
+        finally:
+            if changed:
+                self._version = None
+                self.cache.invalidate(self.owner_id)
+
+
+class TaskCacheListener:
+    """
+    Applies invalidations published by other replicas
+
+    Holds one dedicated LISTEN connection (outside the pool, and direct to
+    Postgres since transaction poolers don't deliver notifications). While it
+    is down the cache serves nothing, and it starts empty after reconnecting,
+    so missed notifications can't leave stale entries behind.
+    """
+
+    def __init__(self, cache: TaskReadCache, replica_id: str, database_url: str, health_check_seconds: float = 30.0):
+        self.cache = cache
+        self.replica_id = replica_id
+        self.database_url = database_url
+        self.health_check_seconds = health_check_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    def _connect_args(self) -> Tuple[str, Dict[str, Any]]:
+        """asyncpg DSN and keyword arguments for the SQLAlchemy URL"""
+        url = make_url(self.database_url)
+        query = dict(url.query)
+        kwargs: Dict[str, Any] = {}
+        ssl = query.pop("ssl", None) or query.pop("sslmode", None)
+        if ssl:
+            kwargs["ssl"] = ssl
+        dsn = url.set(drivername="postgresql", query=query).render_as_string(hide_password=False)
+        return dsn, kwargs
+
+    def _on_notification(self, connection, pid, channel, payload: str) -> None:
+        replica_id, _, owner_id = payload.partition(":")
+        if replica_id == self.replica_id:
+            # Already invalidated locally when the write committed
+            return
+        try:
+            self.cache.invalidate(UUID(owner_id), remote=True)
+        except ValueError:
+            logger.warning("Ignoring malformed task cache invalidation %r", payload)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self.cache.available = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        import asyncpg
+
+        dsn, kwargs = self._connect_args()
+        delay = 1.0
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(dsn, **kwargs)
+                closed = asyncio.get_running_loop().create_future()
+                connection.add_termination_listener(lambda _: closed.done() or closed.set_result(None))
+                await connection.add_listener(INVALIDATION_CHANNEL, self._on_notification)
+                # Anything published while we weren't listening is gone
+                self.cache.clear()
+                self.cache.available = True
+                delay = 1.0
+                while not closed.done():
+                    try:
+                        await asyncio.wait_for(asyncio.shield(closed), self.health_check_seconds)
+                    except asyncio.TimeoutError:
+                        # Half-open connections are only noticed by using them
+                        await connection.fetchval("SELECT 1", timeout=self.health_check_seconds)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Task cache invalidation listener failed: %s", e)
+            finally:
+                self.cache.available = False
+                if connection is not None and not connection.is_closed():
+                    await connection.close(timeout=5)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+
+# This process, as named in invalidation payloads
+REPLICA_ID = uuid4().hex
+
+task_cache = TaskReadCache(
+    max_entries=settings.task_cache_max_entries,
+    max_bytes=settings.task_cache_max_bytes,
+    ttl_seconds=settings.task_cache_ttl_seconds,
+)
+
+
+def _build_listener() -> Optional[TaskCacheListener]:
+    url = settings.task_cache_listen_url or settings.database_url
+    parsed = make_url(url)
+    if not settings.task_cache_enabled or parsed.get_backend_name() != "postgresql":
+        # A single SQLite process has nothing to listen to
+        return None
+    if not settings.task_cache_listen_url and _uses_transaction_pooler(parsed):
+        logger.warning(
+            "DATABASE_URL points at a transaction pooler, which doesn't deliver LISTEN "
+            "notifications; set TASK_CACHE_LISTEN_URL to a direct connection. Until then "
+            "cached task reads can be up to %ss stale across replicas.",
+            settings.task_cache_ttl_seconds,
+        )
+        return None
+    return TaskCacheListener(task_cache, REPLICA_ID, url)
+
+
+task_cache_listener = _build_listener()
+
+
+def make_task_repository(db_session: AsyncSession, owner_id: UUID) -> TaskRepository:
+    """The task repository request handlers and tools use: cached unless disabled"""
+    if not settings.task_cache_enabled:
+        return TaskRepository(db_session, owner_id)
+    return CachedTaskRepository(db_session, owner_id, task_cache, REPLICA_ID)
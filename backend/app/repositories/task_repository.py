@@ -1,61 +1,378 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import update, delete
+from sqlalchemy import insert, update, delete, tuple_, case, literal, not_, or_, func, text, literal_column, Integer, Float
 from app.models.task import Task
-from app.schemas.task import TaskCreate, TaskUpdate
-from typing import List, Optional
-from uuid import UUID
+from app.models.user import User
+from app.schemas.task import TaskCreate, TaskUpdate, TaskFilter
+from app.utils.pagination import DEFAULT_SORT, PRIORITY_RANKS, parse_sort
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+import re
+
+
+# Rows fetched per round trip when streaming exports
+EXPORT_BATCH_SIZE = 1000
+
+# Search terms beyond this are ignored
+_MAX_SEARCH_TERMS = 16
+
+# Staging table and columns used by COPY-based bulk imports
+_IMPORT_STAGING_TABLE = "task_import_staging"
+_IMPORT_COLUMNS = ("id", "user_id", "title", "description", "completed", "priority")
+
+# SQL expressions the task list can be ordered by, keyed by sort field
+_SORT_COLUMNS = {
+    "created_at": Task.created_at,
+    "updated_at": Task.updated_at,
+    "title": Task.title,
+    "priority": case(PRIORITY_RANKS, value=Task.priority, else_=0),
+}
+
+
+def _order_by(field: str, descending: bool):
+    """ORDER BY clauses for a sort field, with id as the unique tiebreaker"""
+    column = _SORT_COLUMNS[field]
+    if descending:
+        return column.desc(), Task.id.desc()
+    return column.asc(), Task.id.asc()
+
+
+def _search_terms(query: str) -> List[str]:
+    """Split a free-text query into word terms safe to embed in tsquery/FTS5 syntax"""
+    return re.findall(r"\w+", query.lower())[:_MAX_SEARCH_TERMS]
+
+
+def _apply_filters(stmt, filters: Optional[TaskFilter]):
+    """Push task list filters down into the WHERE clause"""
+    if filters is None:
+        return stmt
+    if filters.completed is not None:
+        stmt = stmt.where(Task.completed == filters.completed)
+    if filters.priority is not None:
+        stmt = stmt.where(Task.priority == filters.priority)
+    if filters.created_after is not None:
+        stmt = stmt.where(Task.created_at > filters.created_after)
+    if filters.created_before is not None:
+        stmt = stmt.where(Task.created_at < filters.created_before)
+    if filters.updated_since is not None:
+        stmt = stmt.where(Task.updated_at >= filters.updated_since)
+    return stmt
 
 
 class TaskRepository:
-    def __init__(self, db_session: AsyncSession):
+    """Task queries scoped to the tasks of a single owner"""
+
+    def __init__(self, db_session: AsyncSession, owner_id: UUID):
         self.db_session = db_session
+        self.owner_id = owner_id
+
+    def _owned(self, stmt):
+        """Restrict a statement to the owner's tasks; every index leads with user_id"""
+        return stmt.where(Task.user_id == self.owner_id)
+
+    def _row(self, task_create: TaskCreate) -> Dict[str, Any]:
+        return {**task_create.model_dump(), "user_id": self.owner_id}
 
     async def create_task(self, task_create: TaskCreate) -> Task:
         """Create a new task"""
-        db_task = Task(**task_create.model_dump())
+        db_task = Task(**self._row(task_create))
         self.db_session.add(db_task)
-        await self.db_session.commit()
+        await self._commit_write()
         await self.db_session.refresh(db_task)
         return db_task
 
+    async def create_tasks(self, task_creates: List[TaskCreate]) -> List[Task]:
+        """Create many tasks with one multi-row INSERT ... RETURNING"""
+        rows = [self._row(task_create) for task_create in task_creates]
+        stmt = insert(Task).returning(Task, sort_by_parameter_order=True)
+        result = await self.db_session.scalars(stmt, rows)
+        db_tasks = list(result.all())
+        return await self._detach_and_commit(db_tasks)
+
+    async def bulk_load_tasks(self, chunks: AsyncIterator[List[TaskCreate]]) -> int:
+        """Load validated tasks in one transaction, returning how many were inserted.
+
+        On PostgreSQL (asyncpg) each chunk is sent with the binary COPY protocol
+        into a temporary staging table, which is merged into ``tasks`` with one
+        INSERT ... SELECT at the end.  Other backends fall back to batched
+        multi-row INSERTs.
+        """
+        connection = await self.db_session.connection()
+        try:
+            if connection.dialect.driver == "asyncpg":
+                total = await self._copy_load(connection, chunks)
+            else:
+                total = 0
+                async for chunk in chunks:
+                    rows = [self._row(task_create) for task_create in chunk]
+                    await self.db_session.execute(insert(Task), rows)
+                    total += len(rows)
+            await self._commit_write(changed=total > 0)
+        except Exception:
+            await self.db_session.rollback()
+            raise
+        return total
+
+    async def _copy_load(self, connection, chunks: AsyncIterator[List[TaskCreate]]) -> int:
+        """COPY chunks into a staging table and merge them into tasks"""
+        raw_connection = await connection.get_raw_connection()
+        asyncpg_connection = raw_connection.driver_connection
+        await connection.exec_driver_sql(
+            f"CREATE TEMP TABLE {_IMPORT_STAGING_TABLE} (LIKE tasks INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+
+        total = 0
+        async for chunk in chunks:
+            records = [
+                (uuid4(), self.owner_id, task.title, task.description, task.completed, task.priority)
+                for task in chunk
+            ]
+            await asyncpg_connection.copy_records_to_table(
+                _IMPORT_STAGING_TABLE, records=records, columns=_IMPORT_COLUMNS
+            )
+            total += len(records)
+
+        columns = ", ".join(_IMPORT_COLUMNS + ("created_at", "updated_at"))
+        await connection.exec_driver_sql(
+            f"INSERT INTO tasks ({columns}) SELECT {columns} FROM {_IMPORT_STAGING_TABLE}"
+        )
+        return total
+
     async def get_task_by_id(self, task_id: UUID) -> Optional[Task]:
         """Get a task by its ID"""
-        stmt = select(Task).where(Task.id == task_id)
+        stmt = self._owned(select(Task)).where(Task.id == task_id)
         result = await self.db_session.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def get_all_tasks(self) -> List[Task]:
-        """Get all tasks"""
-        stmt = select(Task).order_by(Task.created_at.desc())
+    async def get_version(self) -> Tuple[Optional[datetime], int, int]:
+        """(latest updated_at, task count, task version) of the owner's tasks.
+
+        One aggregate query answered from the (user_id, updated_at) index.
+        Every write through this repository bumps the version, so the tuple
+        changes on any create, update or delete.
+        """
+        version = select(User.task_version).where(User.id == self.owner_id).scalar_subquery()
+        stmt = self._owned(select(func.max(Task.updated_at), func.count(Task.id), version))
+        latest, count, task_version = (await self.db_session.execute(stmt)).one()
+        return latest, count, task_version or 0
+
+    async def get_all_tasks(
+        self,
+        filters: Optional[TaskFilter] = None,
+        sort: str = DEFAULT_SORT,
+    ) -> List[Task]:
+        """Get all tasks matching the given filters"""
+        field, descending = parse_sort(sort)
+        stmt = _apply_filters(self._owned(select(Task)), filters)
+        stmt = stmt.order_by(*_order_by(field, descending))
         result = await self.db_session.execute(stmt)
         return result.scalars().all()
 
-    async def update_task(self, task_id: UUID, task_update: TaskUpdate) -> Optional[Task]:
-        """Update a task"""
-        # Get the task to update
-        db_task = await self.get_task_by_id(task_id)
-        if not db_task:
-            return None
+    async def stream_tasks(
+        self,
+        filters: Optional[TaskFilter] = None,
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ) -> AsyncIterator[List[Task]]:
+        """Stream tasks in batches through a server-side cursor.
 
+        Only ``batch_size`` rows are held in memory at a time, however large
+        the table is.
+        """
+        stmt = _apply_filters(self._owned(select(Task)), filters)
+        stmt = stmt.order_by(Task.created_at.desc(), Task.id.desc())
+        stmt = stmt.execution_options(yield_per=batch_size)
+        result = await self.db_session.stream_scalars(stmt)
+        async for partition in result.partitions():
+            yield partition
+            # Drop the batch from the identity map so memory stays flat
+            for db_task in partition:
+                self.db_session.expunge(db_task)
+
+    async def get_tasks_page(
+        self,
+        limit: int,
+        filters: Optional[TaskFilter] = None,
+        sort: str = DEFAULT_SORT,
+        after: Optional[Tuple[Any, UUID]] = None,
+        before: Optional[Tuple[Any, UUID]] = None,
+    ) -> List[Task]:
+        """Get up to ``limit`` tasks ordered by (sort field, id).
+
+        ``after`` seeks to rows following the given key in sort order and
+        ``before`` to rows preceding it, so every page is a bounded index
+        range scan regardless of how deep it is.  Rows are always returned
+        in sort order.
+        """
+        field, descending = parse_sort(sort)
+        column = _SORT_COLUMNS[field]
+        key = tuple_(column, Task.id)
+
+        def bound(position: Tuple[Any, UUID]):
+            # Bind the cursor values with the columns' types, not types guessed from the values
+            value, task_id = position
+            return tuple_(literal(value, column.type), literal(task_id, Task.id.type))
+
+        stmt = _apply_filters(self._owned(select(Task)), filters)
+        if before is not None:
+            # Walk backwards from the cursor, then flip the rows back around
+            boundary = key > bound(before) if descending else key < bound(before)
+            stmt = stmt.where(boundary).order_by(*_order_by(field, not descending))
+        else:
+            if after is not None:
+                boundary = key < bound(after) if descending else key > bound(after)
+                stmt = stmt.where(boundary)
+            stmt = stmt.order_by(*_order_by(field, descending))
+        result = await self.db_session.execute(stmt.limit(limit))
+        tasks = list(result.scalars().all())
+        if before is not None:
+            tasks.reverse()
+        return tasks
+
+    async def find_by_title(self, title: str, fuzzy: bool = False) -> Optional[Task]:
+        """Find a task by case-insensitive title via the lower(title) index.
+
+        With ``fuzzy`` set, an exact miss falls back to search, but only when
+        exactly one task matches; picking the top-ranked of several would be a
+        guess. When several tasks share a title the most recent one wins.
+        """
+        stmt = (
+            self._owned(select(Task))
+            .where(func.lower(Task.title) == title.strip().lower())
+            .order_by(Task.created_at.desc(), Task.id.desc())
+            .limit(1)
+        )
+        result = await self.db_session.execute(stmt)
+        db_task = result.scalar_one_or_none()
+        if db_task is None and fuzzy:
+            matches = await self.search_tasks(title, limit=2)
+            db_task = matches[0] if len(matches) == 1 else None
+        return db_task
+
+    async def search_tasks(self, query: str, limit: int, offset: int = 0) -> List[Task]:
+        """Full-text search over title and description, best matches first.
+
+        PostgreSQL matches the generated ``search_vector`` column (prefix
+        matching on every term) or trigram similarity on the title, so typos
+        still find results.  SQLite uses the ``tasks_fts`` FTS5 index.
+        """
+        terms = _search_terms(query)
+        if not terms:
+            return []
+
+        if self.db_session.get_bind().dialect.name == "sqlite":
+            fts_query = " ".join(f'"{term}"*' for term in terms)
+            matches = (
+                text("SELECT rowid, bm25(tasks_fts) AS rank FROM tasks_fts WHERE tasks_fts MATCH :query")
+                .bindparams(query=fts_query)
+                .columns(rowid=Integer, rank=Float)
+                .subquery("matches")
+            )
+            stmt = (
+                self._owned(select(Task))
+                .join(matches, literal_column("tasks.rowid") == matches.c.rowid)
+                # bm25() scores are negative; lower is a better match
+                .order_by(matches.c.rank.asc(), Task.id.asc())
+            )
+        else:
+            search_vector = literal_column("tasks.search_vector")
+            ts_query = func.to_tsquery("english", " & ".join(f"{term}:*" for term in terms))
+            rank = func.greatest(
+                func.ts_rank_cd(search_vector, ts_query),
+                func.similarity(Task.title, query),
+            )
+            stmt = (
+                self._owned(select(Task))
+                .where(or_(search_vector.op("@@")(ts_query), Task.title.op("%")(query)))
+                .order_by(rank.desc(), Task.id.asc())
+            )
+
+        result = await self.db_session.execute(stmt.limit(limit).offset(offset))
+        return list(result.scalars().all())
+
+    async def update_task(self, task_id: UUID, task_update: TaskUpdate) -> Optional[Task]:
+        """Update a task in a single UPDATE ... RETURNING round trip"""
         # Prepare update data, excluding None values
         update_data = task_update.model_dump(exclude_unset=True)
+        if not update_data:
+            return await self.get_task_by_id(task_id)
 
-        # Update the task
-        stmt = update(Task).where(Task.id == task_id).values(**update_data)
-        await self.db_session.execute(stmt)
+        stmt = self._owned(update(Task)).where(Task.id == task_id).values(**update_data)
+        return await self._update_returning(stmt)
 
-        # Commit the transaction before refreshing
-        await self.db_session.commit()
+    async def toggle_task_completion(self, task_id: UUID) -> Optional[Task]:
+        """Atomically flip a task's completion status (completed = NOT completed)"""
+        stmt = self._owned(update(Task)).where(Task.id == task_id).values(completed=not_(Task.completed))
+        return await self._update_returning(stmt)
 
-        # Refresh the task to get updated values
-        await self.db_session.refresh(db_task)
+    async def update_tasks(self, task_updates: Dict[UUID, Dict[str, Any]]) -> List[Task]:
+        """Apply per-task changes with one set-based UPDATE ... RETURNING.
+
+        ``task_updates`` maps task ids to the fields to set on that task.  Each
+        column is rewritten as ``CASE id WHEN ... END`` so all rows change in a
+        single statement; tasks that don't exist are simply not returned.
+        """
+        columns: Dict[str, Dict[UUID, Any]] = {}
+        for task_id, changes in task_updates.items():
+            for name, value in changes.items():
+                columns.setdefault(name, {})[task_id] = value
+        if not columns:
+            stmt = self._owned(select(Task)).where(Task.id.in_(task_updates.keys()))
+            result = await self.db_session.execute(stmt)
+            return list(result.scalars().all())
+
+        values = {
+            name: case(per_task, value=Task.id, else_=getattr(Task, name))
+            for name, per_task in columns.items()
+        }
+        stmt = self._owned(update(Task)).where(Task.id.in_(task_updates.keys())).values(**values)
+        stmt = stmt.returning(Task).execution_options(
+            synchronize_session=False, populate_existing=True
+        )
+        result = await self.db_session.execute(stmt)
+        return await self._detach_and_commit(list(result.scalars().all()))
 
+    async def _update_returning(self, stmt) -> Optional[Task]:
+        """Run an UPDATE with RETURNING and commit, returning the updated row or None"""
+        stmt = stmt.returning(Task).execution_options(
+            synchronize_session=False, populate_existing=True
+        )
+        result = await self.db_session.execute(stmt)
+        db_task = result.scalar_one_or_none()
+        await self._detach_and_commit([db_task] if db_task is not None else [])
         return db_task
 
+    async def _detach_and_commit(self, db_tasks: List[Task]) -> List[Task]:
+        """Commit the transaction without expiring the rows it returned"""
+        # Detached objects keep their loaded state, so no refresh is needed
+        for db_task in db_tasks:
+            self.db_session.expunge(db_task)
+        await self._commit_write(changed=bool(db_tasks))
+        return db_tasks
+
     async def delete_task(self, task_id: UUID) -> bool:
         """Delete a task"""
-        stmt = delete(Task).where(Task.id == task_id)
+        stmt = self._owned(delete(Task)).where(Task.id == task_id)
         result = await self.db_session.execute(stmt)
-        await self.db_session.commit()
-        return result.rowcount > 0
\ No newline at end of file
+        await self._commit_write(changed=result.rowcount > 0)
+        return result.rowcount > 0
+
+    async def delete_tasks(self, task_ids: List[UUID]) -> List[UUID]:
+        """Delete many tasks with one DELETE ... RETURNING, returning the deleted ids"""
+        stmt = self._owned(delete(Task)).where(Task.id.in_(task_ids)).returning(Task.id)
+        result = await self.db_session.execute(stmt)
+        deleted_ids = list(result.scalars().all())
+        await self._commit_write(changed=bool(deleted_ids))
+        return deleted_ids
+
+    async def _commit_write(self, changed: bool = True) -> None:
+        """Commit a write, bumping the owner's task version in the same transaction if rows changed"""
+        if changed:
+            stmt = (
+                update(User)
+                .where(User.id == self.owner_id)
+                # Keep updated_at; the account itself didn't change
+                .values(task_version=User.task_version + 1, updated_at=User.updated_at)
+            )
+            await self.db_session.execute(stmt)
+        await self.db_session.commit()
\ No newline at end of file
@@ -0,0 +1,30 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import delete, func
+from app.models.revoked_token import RevokedToken
+from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TokenRepository:
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    async def is_revoked(self, jti: str) -> bool:
+        """Check whether a token id has been revoked"""
+        stmt = select(RevokedToken.jti).where(RevokedToken.jti == jti)
+        result = await self.db_session.execute(stmt)
+        return result.scalar_one_or_none() is not None
+
+    async def revoke(self, jti: str, expires_at: datetime) -> None:
+        """Revoke a token id until its expiry, purging entries that have already expired"""
+        try:
+            await self.db_session.execute(delete(RevokedToken).where(RevokedToken.expires_at < func.now()))
+            await self.db_session.merge(RevokedToken(jti=jti, expires_at=expires_at))
+            await self.db_session.commit()
+        except Exception as e:
+            logger.error(f"Error revoking token {jti}: {e}")
+            await self.db_session.rollback()
+            raise
@@ -1,14 +1,29 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import insert
 from sqlalchemy.exc import IntegrityError
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
+from app.core.security import hash_password, verify_and_update_password
+from app.utils.exceptions import UserAlreadyExistsException
 from typing import Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _conflicting_field(error: IntegrityError) -> Optional[str]:
+    """Work out which unique field ("email" or "username") an insert collided on"""
+    # asyncpg exposes the violated constraint/index name (e.g. users_email_key or
+    # ix_users_username); other drivers only put it in the message
+    driver_error = getattr(error.orig, "__cause__", None) or error.orig
+    constraint = getattr(driver_error, "constraint_name", None) or str(error.orig)
+    for field in ("username", "email"):
+        if field in constraint:
+            return field
+    return None
+
+
 class UserRepository:
     def __init__(self, db_session: AsyncSession):
         self.db_session = db_session
@@ -32,43 +47,40 @@ class UserRepository:
         return result.scalar_one_or_none()
 
     async def create_user(self, user_data: UserCreate) -> Optional[User]:
-        """Create a new user"""
+        """Create a new user with a single INSERT ... RETURNING.
+
+        Uniqueness is left to the database: a duplicate email or username
+        surfaces as a unique violation, which is mapped back to the offending
+        field and raised as UserAlreadyExistsException.  This avoids separate
+        existence checks and the race between them and the insert.
+        """
+        password_hash = await hash_password(user_data.password)
+        stmt = insert(User).values(
+            email=user_data.email,
+            username=user_data.username,
+            password_hash=password_hash
+        ).returning(User)
         try:
-            # Check if user with email already exists
-            existing_user = await self.get_user_by_email(user_data.email)
-            if existing_user:
-                logger.warning(f"User with email {user_data.email} already exists")
-                return None
-
-            # Check if user with username already exists
-            existing_user = await self.get_user_by_username(user_data.username)
-            if existing_user:
-                logger.warning(f"User with username {user_data.username} already exists")
-                return None
-
-            # Create new user
-            user = User(
-                email=user_data.email,
-                username=user_data.username
-            )
-            user.set_password(user_data.password)
-
-            self.db_session.add(user)
+            result = await self.db_session.execute(stmt)
+            user = result.scalar_one()
+            # Detach so the commit doesn't expire the values RETURNING gave us
+            self.db_session.expunge(user)
             await self.db_session.commit()
-            await self.db_session.refresh(user)
-
-            logger.info(f"Created new user with email: {user_data.email}")
-            return user
         except IntegrityError as e:
-            logger.error(f"Integrity error during user creation: {e}")
             await self.db_session.rollback()
-            return None
+            field = _conflicting_field(e)
+            if field is None:
+                logger.error(f"Integrity error during user creation: {e}")
+                raise
+            logger.warning(f"User with {field} {getattr(user_data, field)} already exists")
+            raise UserAlreadyExistsException(field) from e
         except Exception as e:
             logger.error(f"Unexpected error during user creation: {e}")
-            import traceback
-            traceback.print_exc()
             await self.db_session.rollback()
-            return None
+            raise
+
+        logger.info(f"Created new user with email: {user_data.email}")
+        return user
 
     async def update_user(self, user_id: str, user_data: UserUpdate) -> Optional[User]:
         """Update a user's information"""
@@ -111,6 +123,20 @@ class UserRepository:
     async def authenticate_user(self, email: str, password: str) -> Optional[User]:
         """Authenticate a user by email and password"""
         user = await self.get_user_by_email(email)
-        if not user or not user.verify_password(password):
+        if not user:
+            return None
+
+        valid, new_hash = await verify_and_update_password(password, user.password_hash)
+        if not valid:
             return None
+
+        if new_hash:
+            # Hash was made with outdated parameters; upgrade it transparently
+            try:
+                user.password_hash = new_hash
+                await self.db_session.commit()
+                await self.db_session.refresh(user)
+            except Exception as e:
+                logger.error(f"Error rehashing password for user {user.id}: {e}")
+                await self.db_session.rollback()
         return user
\ No newline at end of file
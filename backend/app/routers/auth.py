@@ -1,10 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.auth import AuthenticatedUser, get_current_user, revoke_token
+from app.core.settings import settings
+from app.core.tokens import create_access_token
 from app.db.database import get_async_session
-from app.schemas.user import UserCreate, UserLogin, UserLoginResponse
+from app.schemas.user import UserCreate, UserLogin, UserLoginResponse, CurrentUserResponse
 from app.services.user_service import UserService
 from app.repositories.user_repository import UserRepository
-from typing import Dict
+from app.utils.exceptions import InvalidTokenException, UserAlreadyExistsException
+from typing import Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -22,83 +30,40 @@ async def signup(
 ):
     """Register a new user"""
     try:
-        print(f"DEBUG: Received signup request for email: {user_create.email}, username: {user_create.username}")
-
-        # Check if user already exists
-        existing_user = await user_service.get_user_by_email(user_create.email)
-        if existing_user:
-            print(f"DEBUG: User with email {user_create.email} already exists")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="A user with this email already exists"
-            )
-
-        print(f"DEBUG: No existing user with email {user_create.email}")
-
-        # Check if username already exists
-        existing_user_by_username = await user_service.get_user_by_username(user_create.username)
-        if existing_user_by_username:
-            print(f"DEBUG: User with username {user_create.username} already exists")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="A user with this username already exists"
-            )
-
-        print(f"DEBUG: No existing user with username {user_create.username}")
-
-        # Create new user
-        print(f"DEBUG: Attempting to create user with email: {user_create.email}")
+        # One INSERT; duplicate emails/usernames come back as a unique violation
         user = await user_service.create_user(user_create)
-        print(f"DEBUG: User creation result: {user}")
-
-        if not user:
-            print(f"DEBUG: Failed to create user - returned None")
-
-            # Let's double-check if the user was actually created despite returning None
-            check_user = await user_service.get_user_by_email(user_create.email)
-            if check_user:
-                print(f"DEBUG: User was created but not returned: {check_user.email}")
-            else:
-                print(f"DEBUG: User was not created in the database")
-
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to create user"
-            )
-
-        print(f"DEBUG: User created successfully: {user.email}")
-
-        # Extract user data to avoid potential lazy-loading issues when session closes
-        user_data = {
-            "id": user.id,
-            "email": user.email,
-            "username": user.username,
-            "is_active": user.is_active,
-            "created_at": user.created_at,
-            "updated_at": user.updated_at
-        }
-
-        # Return user info (without password)
-        return UserLoginResponse(**user_data)
-    except HTTPException:
-        print(f"DEBUG: HTTPException caught")
-        raise
-    except Exception as e:
-        print(f"DEBUG: Unexpected exception: {str(e)}")
-        import traceback
-        traceback.print_exc()
+    except UserAlreadyExistsException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception:
+        logger.exception("Unexpected error during signup")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An error occurred during registration: {str(e)}"
+            detail="An error occurred during registration"
         )
 
+    # Extract user data to avoid potential lazy-loading issues when session closes
+    user_data = {
+        "id": user.id,
+        "email": user.email,
+        "username": user.username,
+        "is_active": user.is_active,
+        "created_at": user.created_at,
+        "updated_at": user.updated_at
+    }
+
+    # Return user info (without password)
+    return UserLoginResponse(**user_data)
+
 
 @router.post("/signin", response_model=UserLoginResponse)
 async def signin(
     user_login: UserLogin,
     user_service: UserService = Depends(get_user_service)
 ):
-    """Authenticate a user and return user info"""
+    """Authenticate a user and return user info with a bearer access token"""
     try:
         # Authenticate user
         user = await user_service.authenticate_user(user_login.email, user_login.password)
@@ -124,8 +89,16 @@ async def signin(
             "updated_at": user.updated_at
         }
 
+        # Issue an access token so later requests don't resend the password
+        access_token, _ = create_access_token(user.id)
+
         # Return user info (without password)
-        return UserLoginResponse(**user_data)
+        return UserLoginResponse(
+            **user_data,
+            access_token=access_token,
+            token_type="bearer",
+            expires_in=settings.access_token_ttl_seconds
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -136,6 +109,21 @@ async def signin(
 
 
 @router.post("/signout")
-async def signout():
-    """Simple signout endpoint - no session management needed for this basic implementation"""
-    return {"message": "Successfully signed out"}
\ No newline at end of file
+async def signout(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
+    db_session: AsyncSession = Depends(get_async_session)
+):
+    """Sign out, revoking the bearer access token if one is sent"""
+    if credentials is not None:
+        try:
+            await revoke_token(credentials.credentials, db_session)
+        except InvalidTokenException:
+            # Already expired or never valid; nothing to revoke
+            pass
+    return {"message": "Successfully signed out"}
+
+
+@router.get("/me", response_model=CurrentUserResponse)
+async def read_current_user(current_user: AuthenticatedUser = Depends(get_current_user)):
+    """Return the user behind the bearer access token"""
+    return CurrentUserResponse.model_validate(current_user)
\ No newline at end of file
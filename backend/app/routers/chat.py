@@ -1,6 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional
+import json
+import math
 import sys
 import os
 
@@ -8,10 +11,30 @@ import os
 backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 sys.path.insert(0, backend_dir)
 
-from mcp.agent import get_gemini_response
+from app.core.auth import AuthenticatedUser, get_current_user
+from mcp.agent import get_gemini_response, stream_gemini_response
+from mcp.gemini_client import get_gemini_client
+from mcp.intent_parser import intent_stats
+from app.utils.exceptions import LLMUnavailableException
 
 router = APIRouter()
 
+
+def _unavailable(detail: str, retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+def _circuit_open() -> bool:
+    try:
+        return get_gemini_client().guard.breaker.retry_after() > 0
+    except Exception:
+        return False
+
+
 class ChatRequest(BaseModel):
     message: str
 
@@ -19,12 +42,74 @@ class ChatResponse(BaseModel):
     response: str
 
 @router.post("/chat", response_model=ChatResponse)
-async def chat_with_agent(request: ChatRequest):
+async def chat_with_agent(
+    request: ChatRequest,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
     """
-    Chat with the Gemini agent that can interact with the todo app
+    Chat with the Gemini agent that can interact with the caller's tasks
     """
     try:
-        response = await get_gemini_response(request.message)
+        response = await get_gemini_response(request.message, current_user.id)
         return ChatResponse(response=response)
+    except LLMUnavailableException as e:
+        raise _unavailable(e.message, e.retry_after)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error processing chat request: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error processing chat request: {str(e)}")
+
+
+async def _sse_events(events, first_event=None):
+    # Flush headers right away so the client sees the stream open before
+    # the task context is loaded and Gemini produces its first token
+    yield ": stream opened\n\n"
+    if first_event is not None:
+        event, data = first_event
+        yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    async for event, data in events:
+        yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/chat/stream")
+async def stream_chat_with_agent(
+    request: ChatRequest,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """
+    Chat with the Gemini agent, streaming the reply as Server-Sent Events
+
+    Emits `token` events while Gemini writes a conversational reply, `action`
+    and `result` events around tool execution, and a final `done` (or `error`)
+    event carrying the full response. While Gemini's circuit is open, requests
+    that need it fail with 503 and Retry-After before the stream starts.
+    """
+    events = stream_gemini_response(request.message, current_user.id)
+    first_event = None
+    if _circuit_open():
+        # Either a fast-path command (answered locally) or an immediate rejection
+        first_event = await events.__anext__()
+        event, data = first_event
+        if event == "error" and "retry_after" in data:
+            raise _unavailable(data["detail"], data["retry_after"])
+
+    return StreamingResponse(
+        _sse_events(events, first_event),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/chat/metrics")
+async def chat_metrics():
+    """
+    Runtime metrics of the chat agent: fast-path and response cache hit
+    rates, Gemini concurrency, retries and circuit breaker state
+    """
+    try:
+        gemini_client = get_gemini_client()
+        response_cache = gemini_client.cache_stats()
+        gemini = gemini_client.guard_stats()
+    except Exception:
+        # Gemini isn't configured; the fast path still works without it
+        response_cache = {"enabled": False}
+        gemini = None
+    return {"intent_parser": intent_stats.stats(), "response_cache": response_cache, "gemini": gemini}
@@ -1,20 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional, Tuple
 from uuid import UUID
+from datetime import datetime
 
-from app.db.database import get_async_session
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse
+from app.core.auth import AuthenticatedUser, get_current_user
+from app.db.database import get_async_session, AsyncSessionLocal
+from app.schemas.task import (
+    TaskCreate, TaskUpdate, TaskResponse, TaskFilter,
+    TaskBatchCreate, TaskBatchUpdate, TaskBatchDelete, TaskBatchResponse,
+    TaskImportResult, TaskPage,
+)
 from app.services.task_service import TaskService
 from app.repositories.task_repository import TaskRepository
-from app.utils.exceptions import TaskNotFoundException
+from app.repositories.task_cache import make_task_repository
+from app.utils.etag import CACHE_CONTROL, etag_matches, http_date, make_etag, not_modified_since
+from app.utils.exceptions import TaskNotFoundException, InvalidCursorException
+from app.utils.pagination import DEFAULT_SORT, SORT_PATTERN
+from app.utils.responses import ModelResponse, dump_json
+from app.utils.singleflight import SingleFlight
 
 router = APIRouter()
 
+# Concurrent identical list requests share one query and one serialized body
+task_list_flights: SingleFlight[Tuple[TaskPage, bytes]] = SingleFlight()
 
-def get_task_service(db_session: AsyncSession = Depends(get_async_session)):
-    """Dependency to get the task service with repository"""
-    task_repo = TaskRepository(db_session)
+
+def get_task_service(
+    db_session: AsyncSession = Depends(get_async_session),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """Dependency to get the task service with a (cached) repository scoped to the caller's tasks"""
+    task_repo = make_task_repository(db_session, current_user.id)
     return TaskService(task_repo)
 
 
@@ -25,35 +43,267 @@ async def create_task(
 ):
     """Create a new task"""
     try:
-        return await task_service.create_task(task_create)
+        task = await task_service.create_task(task_create)
+        return ModelResponse(task, TaskResponse, status_code=201)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/tasks:batchCreate", response_model=TaskBatchResponse, status_code=201)
+async def batch_create_tasks(
+    batch: TaskBatchCreate,
+    task_service: TaskService = Depends(get_task_service)
+):
+    """Create up to 1000 tasks in a single transaction"""
+    try:
+        result = await task_service.batch_create_tasks(batch.tasks)
+        return ModelResponse(result, TaskBatchResponse, status_code=201)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.patch("/tasks:batchUpdate", response_model=TaskBatchResponse)
+async def batch_update_tasks(
+    batch: TaskBatchUpdate,
+    task_service: TaskService = Depends(get_task_service)
+):
+    """Update up to 1000 tasks in a single transaction; missing ids are reported as not_found"""
+    try:
+        result = await task_service.batch_update_tasks(batch.tasks)
+        return ModelResponse(result, TaskBatchResponse)
+    except Exception as e:
+        # Check if this is a database connection error
+        error_str = str(e)
+        if "connection" in error_str.lower() or "database" in error_str.lower() or "sqlalchemy" in error_str.lower():
+            print(f"Database error in batch_update_tasks: {error_str}")
+            raise HTTPException(status_code=503, detail="Service temporarily unavailable. Please try again later.")
+        else:
+            raise HTTPException(status_code=500, detail=f"Error updating tasks: {str(e)}")
+
+
+@router.post("/tasks:batchDelete", response_model=TaskBatchResponse)
+async def batch_delete_tasks(
+    batch: TaskBatchDelete,
+    task_service: TaskService = Depends(get_task_service)
+):
+    """Delete up to 1000 tasks in a single transaction; missing ids are reported as not_found"""
+    try:
+        result = await task_service.batch_delete_tasks(batch.ids)
+        return ModelResponse(result, TaskBatchResponse)
+    except Exception as e:
+        # Check if this is a database connection error
+        error_str = str(e)
+        if "connection" in error_str.lower() or "database" in error_str.lower() or "sqlalchemy" in error_str.lower():
+            print(f"Database error in batch_delete_tasks: {error_str}")
+            raise HTTPException(status_code=503, detail="Service temporarily unavailable. Please try again later.")
+        else:
+            raise HTTPException(status_code=500, detail=f"Error deleting tasks: {str(e)}")
+
+
+@router.post("/tasks/import", response_model=TaskImportResult)
+async def import_tasks(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(ndjson|csv)$", description="Body format; defaults from Content-Type"),
+    task_service: TaskService = Depends(get_task_service)
+):
+    """Bulk import tasks from a streamed NDJSON or CSV body.
+
+    Valid rows are loaded in one transaction (via COPY on PostgreSQL); rows
+    that fail validation are skipped and reported by row number.
+    """
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = "csv" if "csv" in content_type else "ndjson"
+    try:
+        result = await task_service.import_tasks(request.stream(), format)
+        return ModelResponse(result, TaskImportResult)
+    except Exception as e:
+        # Check if this is a database connection error
+        error_str = str(e)
+        if "connection" in error_str.lower() or "database" in error_str.lower() or "sqlalchemy" in error_str.lower():
+            print(f"Database error in import_tasks: {error_str}")
+            raise HTTPException(status_code=503, detail="Service temporarily unavailable. Please try again later.")
+        else:
+            raise HTTPException(status_code=500, detail=f"Error importing tasks: {str(e)}")
+
+
+async def _load_task_list(
+    owner_id: UUID, limit: int, cursor: Optional[str], filters: TaskFilter, sort: str
+) -> Tuple[TaskPage, bytes]:
+    """Load and serialize a list page for every caller in a flight, with its own session"""
+    async with AsyncSessionLocal() as session:
+        task_service = TaskService(make_task_repository(session, owner_id))
+        page = await task_service.get_tasks_page(limit, cursor, filters, sort)
+    return page, dump_json(page.items, List[TaskResponse])
+
+
 @router.get("/tasks", response_model=List[TaskResponse])
 async def get_all_tasks(
+    request: Request,
+    limit: int = Query(50, ge=1, le=200, description="Maximum number of tasks to return"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's Link header"),
+    completed: Optional[bool] = Query(None, description="Only tasks with this completion status"),
+    priority: Optional[str] = Query(None, max_length=20, description="Only tasks with this priority"),
+    created_after: Optional[datetime] = Query(None, description="Only tasks created after this time"),
+    created_before: Optional[datetime] = Query(None, description="Only tasks created before this time"),
+    updated_since: Optional[datetime] = Query(None, description="Only tasks updated at or after this time"),
+    sort: str = Query(DEFAULT_SORT, pattern=SORT_PATTERN, description="Sort key; prefix with '-' for descending"),
+    if_none_match: Optional[str] = Header(None),
+    db_session: AsyncSession = Depends(get_async_session),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     task_service: TaskService = Depends(get_task_service)
 ):
-    """Get all tasks"""
+    """Get a page of tasks, filtered and sorted in the database (newest first by default).
+
+    Pagination links are returned in the ``Link`` header (``rel="next"`` and
+    ``rel="prev"``) and the raw cursors in ``X-Next-Cursor`` / ``X-Prev-Cursor``.
+    A cursor is only valid for the sort key it was issued with.
+
+    Responses carry an ``ETag``; sending it back in ``If-None-Match`` returns
+    304 Not Modified after a single aggregate query when none of the
+    caller's tasks changed. Identical requests that arrive while a page is
+    being loaded wait for that load and share its response body.
+    """
+    filters = TaskFilter(
+        completed=completed,
+        priority=priority,
+        created_after=created_after,
+        created_before=created_before,
+        updated_since=updated_since,
+    )
     try:
-        return await task_service.get_all_tasks()
+        # The ETag covers every task of the caller, so any write invalidates it
+        version = await task_service.get_tasks_version()
+        # The request's session (also used to authenticate) is done; closing it
+        # returns its connection to the pool, so requests waiting on a flight
+        # don't hold connections the flight itself needs
+        await db_session.close()
+        etag = make_etag(version, limit, cursor, filters.model_dump_json(), sort)
+        cache_headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=cache_headers)
+
+        # The ETag is the normalized query plus the task version, so requests
+        # made after a write never join a flight that started before it
+        page, body = await task_list_flights.do(
+            (current_user.id, etag),
+            lambda: _load_task_list(current_user.id, limit, cursor, filters, sort),
+        )
+        headers = dict(cache_headers)
+        links = []
+        if page.next_cursor:
+            next_url = request.url.include_query_params(limit=limit, cursor=page.next_cursor)
+            links.append(f'<{next_url}>; rel="next"')
+            headers["X-Next-Cursor"] = page.next_cursor
+        if page.prev_cursor:
+            prev_url = request.url.include_query_params(limit=limit, cursor=page.prev_cursor)
+            links.append(f'<{prev_url}>; rel="prev"')
+            headers["X-Prev-Cursor"] = page.prev_cursor
+        if links:
+            headers["Link"] = ", ".join(links)
+        return Response(body, media_type="application/json", headers=headers)
+    except InvalidCursorException:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
     except Exception as e:
         # Log the actual error for debugging
         print(f"Database error in get_all_tasks: {str(e)}")
         raise HTTPException(status_code=503, detail="Service temporarily unavailable. Please try again later.")
 
 
+@router.get("/tasks/search", response_model=List[TaskResponse])
+async def search_tasks(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200, description="Search text"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of results to return"),
+    offset: int = Query(0, ge=0, le=10000, description="Number of results to skip"),
+    task_service: TaskService = Depends(get_task_service)
+):
+    """Ranked full-text search over task titles and descriptions.
+
+    Every term is prefix-matched and titles also match by trigram similarity,
+    so partial words and small typos still find tasks. When a full page is
+    returned, a ``Link: rel="next"`` header points at the following page.
+    """
+    try:
+        tasks = await task_service.search_tasks(q, limit, offset)
+        headers = {}
+        if len(tasks) == limit:
+            next_url = request.url.include_query_params(limit=limit, offset=offset + limit)
+            headers["Link"] = f'<{next_url}>; rel="next"'
+        return ModelResponse(tasks, List[TaskResponse], headers=headers)
+    except Exception as e:
+        # Log the actual error for debugging
+        print(f"Database error in search_tasks: {str(e)}")
+        raise HTTPException(status_code=503, detail="Service temporarily unavailable. Please try again later.")
+
+
+async def _stream_export(export_format: str, filters: TaskFilter, owner_id: UUID):
+    """Stream an export with its own session, which must outlive the endpoint call"""
+    async with AsyncSessionLocal() as session:
+        task_service = TaskService(TaskRepository(session, owner_id))
+        async for chunk in task_service.export_tasks(export_format, filters):
+            yield chunk
+
+
+@router.get("/tasks/export")
+async def export_tasks(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Export format"),
+    completed: Optional[bool] = Query(None, description="Only tasks with this completion status"),
+    priority: Optional[str] = Query(None, max_length=20, description="Only tasks with this priority"),
+    created_after: Optional[datetime] = Query(None, description="Only tasks created after this time"),
+    created_before: Optional[datetime] = Query(None, description="Only tasks created before this time"),
+    updated_since: Optional[datetime] = Query(None, description="Only tasks updated at or after this time"),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """Stream every matching task as NDJSON or CSV using a server-side cursor"""
+    filters = TaskFilter(
+        completed=completed,
+        priority=priority,
+        created_after=created_after,
+        created_before=created_before,
+        updated_since=updated_since,
+    )
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _stream_export(format, filters, current_user.id),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format}"'},
+    )
+
+
 @router.get("/tasks/{task_id}", response_model=TaskResponse)
 async def get_task_by_id(
     task_id: UUID,
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
     task_service: TaskService = Depends(get_task_service)
 ):
-    """Get a specific task by ID"""
+    """Get a specific task by ID.
+
+    Supports conditional requests: ``If-None-Match`` against the ``ETag``, or
+    ``If-Modified-Since`` against ``Last-Modified`` (the task's updated_at).
+    """
     try:
         task = await task_service.get_task_by_id(task_id)
         if not task:
             raise HTTPException(status_code=404, detail=f"Task with id {task_id} not found")
-        return task
+        # Hashing the serialized task keeps the ETag exact even within one
+        # timestamp tick; the same bytes are the response body
+        body = dump_json(task, TaskResponse)
+        etag = make_etag(body.decode())
+        cache_headers = {
+            "ETag": etag,
+            "Last-Modified": http_date(task.updated_at),
+            "Cache-Control": CACHE_CONTROL,
+        }
+        # If-Modified-Since only applies when no If-None-Match was sent
+        if etag_matches(if_none_match, etag) or (
+            if_none_match is None and not_modified_since(if_modified_since, task.updated_at)
+        ):
+            return Response(status_code=304, headers=cache_headers)
+        return Response(body, media_type="application/json", headers=cache_headers)
+    except HTTPException:
+        raise
     except ValueError:
         # Raised when task_id is not a valid UUID
         raise HTTPException(status_code=400, detail="Invalid task ID format")
@@ -78,7 +328,9 @@ async def update_task(
         task = await task_service.update_task(task_id, task_update)
         if not task:
             raise HTTPException(status_code=404, detail=f"Task with id {task_id} not found")
-        return task
+        return ModelResponse(task, TaskResponse)
+    except HTTPException:
+        raise
     except ValueError:
         # Raised when task_id is not a valid UUID
         raise HTTPException(status_code=400, detail="Invalid task ID format")
@@ -99,13 +351,12 @@ async def toggle_task_completion(
 ):
     """Toggle the completion status of a task"""
     try:
-        task = await task_service.get_task_by_id(task_id)
+        task = await task_service.toggle_task_completion(task_id)
         if not task:
             raise HTTPException(status_code=404, detail=f"Task with id {task_id} not found")
-
-        # Update the completion status
-        updated_task = await task_service.update_task(task_id, TaskUpdate(completed=not task.completed))
-        return updated_task
+        return ModelResponse(task, TaskResponse)
+    except HTTPException:
+        raise
     except ValueError:
         # Raised when task_id is not a valid UUID
         raise HTTPException(status_code=400, detail="Invalid task ID format")
@@ -130,6 +381,8 @@ async def delete_task(
         if not deleted:
             raise HTTPException(status_code=404, detail=f"Task with id {task_id} not found")
         return
+    except HTTPException:
+        raise
     except ValueError:
         # Raised when task_id is not a valid UUID
         raise HTTPException(status_code=400, detail="Invalid task ID format")
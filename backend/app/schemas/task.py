@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from pydantic.config import ConfigDict
-from typing import Optional
+from typing import Any, Iterable, List, Literal, Optional
 from uuid import UUID
 from datetime import datetime
 
@@ -23,9 +23,89 @@ class TaskUpdate(BaseModel):
     priority: Optional[str] = Field(None, min_length=1, max_length=20)
 
 
+class TaskFilter(BaseModel):
+    completed: Optional[bool] = None
+    priority: Optional[str] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    updated_since: Optional[datetime] = None
+
+
 class TaskResponse(TaskBase):
     id: UUID
     created_at: datetime
     updated_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TaskPage(BaseModel):
+    items: List[TaskResponse]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+_task_list_adapter = TypeAdapter(List[TaskResponse])
+_TASK_RESPONSE_FIELDS = frozenset(TaskResponse.model_fields)
+
+
+def _loaded_values(row: Any) -> Any:
+    values = getattr(row, "__dict__", {})
+    if "_sa_instance_state" in values and _TASK_RESPONSE_FIELDS <= values.keys():
+        return values
+    return row
+
+
+def task_responses(rows: Iterable[Any]) -> List[TaskResponse]:
+    """Convert task rows to TaskResponse in a single pydantic-core call.
+
+    Loaded ORM rows are validated from their instance __dict__: going through
+    SQLAlchemy's instrumented attributes costs more than the validation
+    itself. Rows with expired or deferred columns, and objects that already
+    are TaskResponse, are read with from_attributes as before.
+    """
+    return _task_list_adapter.validate_python([_loaded_values(row) for row in rows], from_attributes=True)
+
+
+
+# Upper bound on the number of items accepted by the batch endpoints
+MAX_BATCH_SIZE = 1000
+
+
+class TaskBatchCreate(BaseModel):
+    tasks: List[TaskCreate] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class TaskBatchUpdateItem(TaskUpdate):
+    id: UUID
+
+
+class TaskBatchUpdate(BaseModel):
+    tasks: List[TaskBatchUpdateItem] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class TaskBatchDelete(BaseModel):
+    ids: List[UUID] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class TaskBatchItemResult(BaseModel):
+    index: int
+    id: Optional[UUID] = None
+    status: Literal["created", "updated", "deleted", "not_found"]
+    task: Optional[TaskResponse] = None
+
+
+class TaskBatchResponse(BaseModel):
+    results: List[TaskBatchItemResult]
+
+
+
+class TaskImportError(BaseModel):
+    row: int
+    error: str
+
+
+class TaskImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[TaskImportError]
@@ -34,6 +34,15 @@ class UserResponse(UserBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class CurrentUserResponse(BaseModel):
+    id: UUID
+    email: EmailStr
+    username: str
+    is_active: bool
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class UserLoginResponse(BaseModel):
     id: UUID
     email: EmailStr
@@ -42,5 +51,8 @@ class UserLoginResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     message: str = "Login successful"
+    access_token: Optional[str] = None
+    token_type: Optional[str] = None
+    expires_in: Optional[int] = None
 
     model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
@@ -1,7 +1,89 @@
-from typing import List, Optional
+from typing import Any, AsyncIterator, List, Optional, Tuple
+import codecs
+import csv
+import io
+import json
+from pydantic import ValidationError
 from uuid import UUID
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse
+from app.schemas.task import (
+    TaskCreate, TaskUpdate, TaskResponse, TaskPage, TaskFilter,
+    TaskBatchUpdateItem, TaskBatchItemResult, TaskBatchResponse,
+    TaskImportError, TaskImportResult, task_responses,
+)
 from app.repositories.task_repository import TaskRepository
+from app.utils.pagination import DEFAULT_SORT, decode_cursor, encode_cursor, parse_sort, sort_value
+
+
+# Column order of CSV exports
+EXPORT_FIELDS = ("id", "title", "description", "completed", "priority", "created_at", "updated_at")
+
+# Validated rows handed to the repository per COPY/INSERT batch
+IMPORT_CHUNK_SIZE = 5000
+# Per-row errors echoed back in an import result (the failure count is exact)
+MAX_REPORTED_IMPORT_ERRORS = 1000
+
+
+def _describe_error(error: Exception) -> str:
+    """One-line description of why an import row was rejected"""
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in detail['loc']) or 'row'}: {detail['msg']}"
+            for detail in error.errors()
+        )
+    return str(error)
+
+
+async def _iter_lines(byte_stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a streamed request body into text lines"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for data in byte_stream:
+        pending += decoder.decode(data)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def _iter_records(byte_stream: AsyncIterator[bytes], import_format: str) -> AsyncIterator[Tuple[int, Any]]:
+    """Yield (row number, raw record) pairs from an NDJSON or CSV body"""
+    row = 0
+    if import_format == "csv":
+        header = None
+        record = ""
+        async for line in _iter_lines(byte_stream):
+            # A quoted field may contain newlines; a complete CSV record always
+            # has an even number of quote characters
+            record = f"{record}\n{line}" if record else line
+            if record.count('"') % 2:
+                continue
+            text, record = record, ""
+            if not text.strip():
+                continue
+            values = next(csv.reader([text]))
+            if header is None:
+                header = [name.strip() for name in values]
+                continue
+            row += 1
+            if len(values) != len(header):
+                yield row, ValueError(f"Expected {len(header)} columns, got {len(values)}")
+                continue
+            # Empty cells mean "use the default" rather than an empty string
+            yield row, {name: value for name, value in zip(header, values) if value != ""}
+        if record:
+            row += 1
+            yield row, ValueError("Unterminated quoted field")
+    else:
+        async for line in _iter_lines(byte_stream):
+            if not line.strip():
+                continue
+            row += 1
+            try:
+                yield row, json.loads(line)
+            except ValueError as e:
+                yield row, ValueError(f"Invalid JSON: {e}")
 
 
 class TaskService:
@@ -13,6 +95,51 @@ class TaskService:
         db_task = await self.task_repository.create_task(task_create)
         return TaskResponse.model_validate(db_task)
 
+    async def batch_create_tasks(self, task_creates: List[TaskCreate]) -> TaskBatchResponse:
+        """Create many tasks in one round trip"""
+        db_tasks = await self.task_repository.create_tasks(task_creates)
+        return TaskBatchResponse(results=[
+            TaskBatchItemResult(
+                index=index,
+                id=task.id,
+                status="created",
+                task=task,
+            )
+            for index, task in enumerate(task_responses(db_tasks))
+        ])
+
+    async def import_tasks(self, byte_stream: AsyncIterator[bytes], import_format: str) -> TaskImportResult:
+        """Validate and bulk load tasks from a streamed NDJSON or CSV body.
+
+        Rows are validated against TaskCreate in chunks as they arrive; valid
+        rows are loaded in a single transaction and invalid ones are reported
+        by row number.
+        """
+        errors: List[TaskImportError] = []
+        failed = 0
+
+        async def valid_chunks() -> AsyncIterator[List[TaskCreate]]:
+            nonlocal failed
+            chunk: List[TaskCreate] = []
+            async for row, record in _iter_records(byte_stream, import_format):
+                try:
+                    if isinstance(record, Exception):
+                        raise record
+                    chunk.append(TaskCreate.model_validate(record))
+                except (ValueError, ValidationError) as e:
+                    failed += 1
+                    if len(errors) < MAX_REPORTED_IMPORT_ERRORS:
+                        errors.append(TaskImportError(row=row, error=_describe_error(e)))
+                    continue
+                if len(chunk) >= IMPORT_CHUNK_SIZE:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
+        imported = await self.task_repository.bulk_load_tasks(valid_chunks())
+        return TaskImportResult(imported=imported, failed=failed, errors=errors)
+
     async def get_task_by_id(self, task_id: UUID) -> Optional[TaskResponse]:
         """Get a task by its ID"""
         db_task = await self.task_repository.get_task_by_id(task_id)
@@ -20,10 +147,97 @@ class TaskService:
             return TaskResponse.model_validate(db_task)
         return None
 
-    async def get_all_tasks(self) -> List[TaskResponse]:
-        """Get all tasks"""
-        db_tasks = await self.task_repository.get_all_tasks()
-        return [TaskResponse.model_validate(task) for task in db_tasks]
+    async def get_all_tasks(
+        self,
+        filters: Optional[TaskFilter] = None,
+        sort: str = DEFAULT_SORT,
+    ) -> List[TaskResponse]:
+        """Get all tasks matching the given filters"""
+        db_tasks = await self.task_repository.get_all_tasks(filters, sort)
+        return task_responses(db_tasks)
+
+    async def export_tasks(
+        self,
+        export_format: str,
+        filters: Optional[TaskFilter] = None,
+    ) -> AsyncIterator[bytes]:
+        """Yield tasks encoded as NDJSON or CSV, one chunk per fetched batch"""
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_FIELDS)
+            yield buffer.getvalue().encode()
+
+        async for batch in self.task_repository.stream_tasks(filters):
+            tasks = task_responses(batch)
+            if export_format == "csv":
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                for task in tasks:
+                    row = task.model_dump(mode="json")
+                    writer.writerow([row[field] for field in EXPORT_FIELDS])
+                yield buffer.getvalue().encode()
+            else:
+                yield "".join(task.model_dump_json() + "\n" for task in tasks).encode()
+
+    async def find_task_by_title(self, title: str, fuzzy: bool = False) -> Optional[TaskResponse]:
+        """Find a task by case-insensitive title, optionally falling back to fuzzy search"""
+        db_task = await self.task_repository.find_by_title(title, fuzzy)
+        if db_task:
+            return TaskResponse.model_validate(db_task)
+        return None
+
+    async def search_tasks(self, query: str, limit: int, offset: int = 0) -> List[TaskResponse]:
+        """Search tasks by title and description, best matches first"""
+        db_tasks = await self.task_repository.search_tasks(query, limit, offset)
+        return task_responses(db_tasks)
+
+    async def get_tasks_version(self) -> str:
+        """Opaque token that changes whenever any of the owner's tasks is created, updated or deleted"""
+        latest, count, deleted = await self.task_repository.get_version()
+        return f"{self.task_repository.owner_id}:{latest.isoformat() if latest else '-'}:{count}:{deleted}"
+
+    async def get_tasks_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        filters: Optional[TaskFilter] = None,
+        sort: str = DEFAULT_SORT,
+    ) -> TaskPage:
+        """Get one page of tasks using an opaque keyset cursor"""
+        field, _ = parse_sort(sort)
+        position = decode_cursor(cursor, sort)
+        after = before = None
+        if position is not None:
+            value, task_id, direction = position
+            if direction == "p":
+                before = (value, task_id)
+            else:
+                after = (value, task_id)
+
+        # Fetch one extra row to learn whether another page exists
+        db_tasks = await self.task_repository.get_tasks_page(
+            limit + 1, filters, sort, after=after, before=before
+        )
+        has_more = len(db_tasks) > limit
+        if has_more:
+            # The extra row is at the far end of the read direction
+            db_tasks = db_tasks[1:] if before is not None else db_tasks[:limit]
+
+        items = task_responses(db_tasks)
+        next_cursor = prev_cursor = None
+        if items:
+            first, last = items[0], items[-1]
+            if before is not None:
+                next_cursor = encode_cursor(sort, sort_value(last, field), last.id, "n")
+                if has_more:
+                    prev_cursor = encode_cursor(sort, sort_value(first, field), first.id, "p")
+            else:
+                if has_more:
+                    next_cursor = encode_cursor(sort, sort_value(last, field), last.id, "n")
+                if after is not None:
+                    prev_cursor = encode_cursor(sort, sort_value(first, field), first.id, "p")
+        return TaskPage(items=items, next_cursor=next_cursor, prev_cursor=prev_cursor)
 
     async def update_task(self, task_id: UUID, task_update: TaskUpdate) -> Optional[TaskResponse]:
         """Update a task"""
@@ -32,6 +246,42 @@ class TaskService:
             return TaskResponse.model_validate(db_task)
         return None
 
+    async def toggle_task_completion(self, task_id: UUID) -> Optional[TaskResponse]:
+        """Toggle the completion status of a task"""
+        db_task = await self.task_repository.toggle_task_completion(task_id)
+        if db_task:
+            return TaskResponse.model_validate(db_task)
+        return None
+
+    async def batch_update_tasks(self, items: List[TaskBatchUpdateItem]) -> TaskBatchResponse:
+        """Update many tasks in one round trip"""
+        task_updates = {
+            item.id: item.model_dump(exclude_unset=True, exclude={"id"}) for item in items
+        }
+        db_tasks = await self.task_repository.update_tasks(task_updates)
+        updated = {task.id: task for task in task_responses(db_tasks)}
+        return TaskBatchResponse(results=[
+            TaskBatchItemResult(
+                index=index,
+                id=item.id,
+                status="updated" if item.id in updated else "not_found",
+                task=updated.get(item.id),
+            )
+            for index, item in enumerate(items)
+        ])
+
     async def delete_task(self, task_id: UUID) -> bool:
         """Delete a task"""
-        return await self.task_repository.delete_task(task_id)
\ No newline at end of file
+        return await self.task_repository.delete_task(task_id)
+
+    async def batch_delete_tasks(self, task_ids: List[UUID]) -> TaskBatchResponse:
+        """Delete many tasks in one round trip"""
+        deleted = set(await self.task_repository.delete_tasks(task_ids))
+        return TaskBatchResponse(results=[
+            TaskBatchItemResult(
+                index=index,
+                id=task_id,
+                status="deleted" if task_id in deleted else "not_found",
+            )
+            for index, task_id in enumerate(task_ids)
+        ])
\ No newline at end of file
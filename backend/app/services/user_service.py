@@ -9,7 +9,7 @@ class UserService:
         self.user_repo = user_repo
 
     async def create_user(self, user_data: UserCreate) -> Optional[User]:
-        """Create a new user"""
+        """Create a new user, raising UserAlreadyExistsException on a duplicate email or username"""
         return await self.user_repo.create_user(user_data)
 
     async def get_user_by_id(self, user_id: str) -> Optional[User]:
@@ -0,0 +1,49 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+
+# Clients may keep responses but must revalidate them on every use; task
+# data is per-user, so shared caches must not store it at all
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong entity tag derived from the given parts"""
+    digest = hashlib.sha256("\x1f".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches etag (weak comparison, as RFC 9110 requires)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite returns naive UTC timestamps
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def http_date(value: datetime) -> str:
+    """Format a timestamp for Last-Modified"""
+    return format_datetime(_as_utc(value), usegmt=True)
+
+
+def not_modified_since(if_modified_since: Optional[str], last_modified: datetime) -> bool:
+    """Whether an If-Modified-Since header is at or after last_modified (to the second)"""
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        # Invalid dates are ignored
+        return False
+    return int(_as_utc(last_modified).timestamp()) <= int(_as_utc(since).timestamp())
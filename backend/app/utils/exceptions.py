@@ -9,4 +9,35 @@ class TaskValidationException(Exception):
     """Raised when task validation fails"""
     def __init__(self, message):
         self.message = message
-        super().__init__(message)
\ No newline at end of file
+        super().__init__(message)
+
+class InvalidCursorException(Exception):
+    """Raised when a pagination cursor cannot be decoded"""
+    def __init__(self, cursor):
+        self.cursor = cursor
+        super().__init__("Invalid pagination cursor")
+
+
+
+class InvalidTokenException(Exception):
+    """Raised when an access token is malformed, forged, expired or revoked"""
+    def __init__(self, message):
+        self.message = message
+        super().__init__(message)
+
+
+
+class UserAlreadyExistsException(Exception):
+    """Raised when a new user's email or username is already taken"""
+    def __init__(self, field):
+        self.field = field
+        super().__init__(f"A user with this {field} already exists")
+
+
+
+class LLMUnavailableException(Exception):
+    """Raised when the language model is overloaded, failing or its circuit is open"""
+    def __init__(self, message, retry_after):
+        self.message = message
+        self.retry_after = retry_after
+        super().__init__(message)
@@ -0,0 +1,70 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+from uuid import UUID
+
+from app.utils.exceptions import InvalidCursorException
+
+
+# Sort keys accepted by the task list endpoints. A leading "-" means descending.
+SORT_FIELDS = ("created_at", "updated_at", "title", "priority")
+SORT_PATTERN = r"^-?(created_at|updated_at|title|priority)$"
+DEFAULT_SORT = "-created_at"
+
+# Priorities are stored as strings, so sorting by priority goes through a rank
+PRIORITY_RANKS = {"low": 1, "medium": 2, "high": 3}
+
+_DATETIME_FIELDS = ("created_at", "updated_at")
+
+# A keyset cursor points at the (sort value, id) of a boundary row and says
+# which way to read from it: "n" for the next page, "p" for the previous page.
+Cursor = Tuple[Any, UUID, str]
+
+
+def parse_sort(sort: str) -> Tuple[str, bool]:
+    """Split a sort key into (field, descending)"""
+    descending = sort.startswith("-")
+    field = sort.lstrip("-")
+    if field not in SORT_FIELDS:
+        raise ValueError(f"Unknown sort field: {field}")
+    return field, descending
+
+
+def sort_value(task: Any, field: str) -> Any:
+    """Return the value a task is ordered by for the given sort field"""
+    if field == "priority":
+        return PRIORITY_RANKS.get(task.priority, 0)
+    return getattr(task, field)
+
+
+def encode_cursor(sort: str, value: Any, task_id: UUID, direction: str = "n") -> str:
+    """Encode a keyset position as an opaque, URL-safe cursor string"""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = {"s": sort, "v": value, "i": str(task_id), "d": direction}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], sort: str = DEFAULT_SORT) -> Optional[Cursor]:
+    """Decode a cursor produced by encode_cursor for the same sort key"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        direction = payload.get("d", "n")
+        if direction not in ("n", "p") or payload["s"] != sort:
+            raise ValueError(payload)
+        field, _ = parse_sort(sort)
+        value = payload["v"]
+        if field in _DATETIME_FIELDS:
+            value = datetime.fromisoformat(value)
+        elif field == "priority" and not isinstance(value, int):
+            raise ValueError(value)
+        elif field == "title" and not isinstance(value, str):
+            raise ValueError(value)
+        return value, UUID(payload["i"]), direction
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        raise InvalidCursorException(cursor) from e
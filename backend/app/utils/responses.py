@@ -0,0 +1,37 @@
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def json_adapter(annotation: Any) -> TypeAdapter:
+    """TypeAdapter for a response type, built once per type"""
+    return TypeAdapter(annotation)
+
+
+def dump_json(content: Any, annotation: Any) -> bytes:
+    """Serialize already validated data to JSON bytes without validating it again"""
+    return json_adapter(annotation).dump_json(content)
+
+
+class ModelResponse(Response):
+    """JSON response serialized straight from validated pydantic models.
+
+    FastAPI skips response_model processing for returned Response objects, so
+    the models are not validated a second time and don't go through
+    jsonable_encoder; pydantic-core writes the bytes in one pass. The route's
+    response_model still documents the schema in OpenAPI.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: Any,
+        annotation: Any,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+    ):
+        super().__init__(dump_json(content, annotation), status_code=status_code, headers=headers)
@@ -0,0 +1,51 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[V]):
+    """Coalesces concurrent calls with the same key into one execution.
+
+    The first caller for a key starts the work; callers arriving while it is
+    in flight await the same result (or exception) instead of repeating it.
+    Nothing is kept once the call finishes, so no result outlives its
+    flight. The work runs in its own task: a caller that is cancelled (e.g.
+    the client went away) doesn't cancel it for the others.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, "asyncio.Task[V]"] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, work: Callable[[], Awaitable[V]]) -> V:
+        """Run work() for key, or join the run already in flight"""
+        self.calls += 1
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = asyncio.ensure_future(work())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.shared += 1
+        return await asyncio.shield(flight)
+
+    def _finish(self, key: Hashable, flight: "asyncio.Task[V]") -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.cancelled():
+            # Mark the exception as retrieved even if every caller went away
+            flight.exception()
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def stats(self) -> Dict[str, Any]:
+        """How many calls joined a flight that was already running"""
+        return {
+            "in_flight": len(self._flights),
+            "calls": self.calls,
+            "shared": self.shared,
+            "shared_ratio": self.shared / self.calls if self.calls else 0.0,
+        }
@@ -0,0 +1,183 @@
+"""
+Chat agent latency benchmark.
+
+Drives POST /api/v1/chat (or /chat/stream) through the full agent path:
+intent parsing, the LLM call, and the tool calls against the database. The
+LLM is the deterministic fake backend, so no network access or
+GEMINI_API_KEY is needed. Each simulated user runs a short conversation that
+mixes fast-path commands with free-form messages only the LLM understands,
+as its own signed-in account, and the benchmark reports throughput and
+p50/p95/p99 latency. Accounts are created before timing starts.
+
+Runs in-process against a throwaway SQLite database by default; needs the
+development requirements (httpx):
+
+    pip install -r requirements-dev.txt
+
+    python -m benchmarks.chat_latency --users 50 --concurrency 16
+    python -m benchmarks.chat_latency --latency-ms 400 --distribution lognormal
+    python -m benchmarks.chat_latency --no-fast-path       # every message hits the LLM
+    python -m benchmarks.chat_latency --stream             # also reports time to first event
+    python -m benchmarks.chat_latency --database-url postgresql+asyncpg://localhost/todo_bench
+    python -m benchmarks.chat_latency --max-p95-ms 500    # exit 1 above this, for CI
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+# One conversation per simulated user: (kind, message template)
+CONVERSATION = [
+    ("llm", "I need to call supplier {n}"),
+    ("fast", "Show my tasks"),
+    ("llm", "finish call supplier {n}"),
+    ("fast", "Add task: Review PR {n}"),
+    ("llm", "drop review PR {n}"),
+    ("llm", "how is my day looking?"),
+]
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _configure(args) -> None:
+    # Settings are read at import time, so the environment is set up first
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        db_file = os.path.join(tempfile.mkdtemp(), "bench_chat.db")
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{db_file}"
+    os.environ["LLM_BACKEND"] = "fake"
+    os.environ["LLM_FAKE_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["LLM_FAKE_LATENCY_DISTRIBUTION"] = args.distribution
+    os.environ["LLM_FAKE_ERROR_RATE"] = str(args.error_rate)
+    os.environ["LLM_FAKE_SEED"] = str(args.seed)
+    os.environ["LLM_MAX_CONCURRENCY"] = str(args.llm_concurrency)
+    os.environ["CHAT_FAST_PATH_ENABLED"] = "false" if args.no_fast_path else "true"
+    os.environ["LLM_CACHE_ENABLED"] = "true" if args.cache else "false"
+
+
+async def run(args) -> float:
+    import httpx
+
+    from app.main import app, startup_event
+
+    await startup_event()
+    endpoint = "/api/v1/chat/stream" if args.stream else "/api/v1/chat"
+    latencies = defaultdict(list)
+    first_event = []
+    failures = defaultdict(int)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+
+        async def sign_in(user: int) -> dict:
+            credentials = {"email": f"bench{user}@example.com", "password": "benchmark-password"}
+            async with semaphore:
+                response = await client.post("/auth/signup", json={**credentials, "username": f"bench{user}"})
+                response.raise_for_status()
+                response = await client.post("/auth/signin", json=credentials)
+                response.raise_for_status()
+            return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        async def send(headers: dict, kind: str, message: str) -> None:
+            start = time.perf_counter()
+            if args.stream:
+                async with client.stream("POST", endpoint, json={"message": message}, headers=headers) as response:
+                    # Time until the first real event, not the initial keep-alive comment
+                    lines = response.aiter_lines()
+                    async for line in lines:
+                        if line.startswith("event:"):
+                            break
+                    first_event.append(time.perf_counter() - start)
+                    async for _ in lines:
+                        pass
+                    ok = response.status_code == 200
+            else:
+                response = await client.post(endpoint, json={"message": message}, headers=headers)
+                ok = response.status_code == 200
+            latencies[kind].append(time.perf_counter() - start)
+            if not ok:
+                failures[response.status_code] += 1
+
+        async def converse(user: int, headers: dict) -> None:
+            async with semaphore:
+                for kind, template in CONVERSATION:
+                    await send(headers, kind, template.format(n=user))
+
+        sessions = await asyncio.gather(*(sign_in(user) for user in range(args.users)))
+        start = time.perf_counter()
+        await asyncio.gather(*(converse(user, headers) for user, headers in enumerate(sessions)))
+        elapsed = time.perf_counter() - start
+        metrics = (await client.get("/api/v1/chat/metrics")).json()
+
+    total = sum(len(samples) for samples in latencies.values())
+    print(f"endpoint:           {endpoint}")
+    print(f"fake LLM latency:   {args.latency_ms:.0f} ms ({args.distribution}), error rate {args.error_rate}")
+    print(f"fast path:          {'disabled' if args.no_fast_path else 'enabled'}")
+    print(f"requests:           {total} in {elapsed:.2f}s ({total / elapsed:.1f}/s)")
+    if failures:
+        print(f"failures:           {dict(failures)}")
+    for kind in ("fast", "llm"):
+        ms = [sample * 1000 for sample in latencies[kind]]
+        if ms:
+            print(
+                f"{kind + ' messages:':<20}p50 {statistics.median(ms):.1f} ms   "
+                f"p95 {_percentile(ms, 95):.1f} ms   p99 {_percentile(ms, 99):.1f} ms"
+            )
+    ms_all = [sample * 1000 for samples in latencies.values() for sample in samples]
+    print(
+        f"{'all messages:':<20}p50 {statistics.median(ms_all):.1f} ms   "
+        f"p95 {_percentile(ms_all, 95):.1f} ms   p99 {_percentile(ms_all, 99):.1f} ms"
+    )
+    if first_event:
+        ms = [sample * 1000 for sample in first_event]
+        print(
+            f"{'first event:':<20}p50 {statistics.median(ms):.1f} ms   "
+            f"p95 {_percentile(ms, 95):.1f} ms   p99 {_percentile(ms, 99):.1f} ms"
+        )
+    print(f"fast-path hit ratio: {metrics['intent_parser']['hit_ratio']:.2f}")
+    if metrics.get("gemini"):
+        gemini = metrics["gemini"]
+        print(f"LLM retries/failures: {gemini['retries']}/{gemini['failures']}, circuit {gemini['circuit']['state']}")
+    return _percentile(ms_all, 95)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=50, help="simulated users, each running one conversation")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="fake LLM latency (mean/median)")
+    parser.add_argument(
+        "--distribution", default="lognormal", choices=["constant", "uniform", "exponential", "lognormal"]
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of fake LLM calls that fail")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--llm-concurrency", type=int, default=8)
+    parser.add_argument("--no-fast-path", action="store_true", help="send every message to the LLM")
+    parser.add_argument("--cache", action="store_true", help="enable the LLM response cache")
+    parser.add_argument("--stream", action="store_true", help="use the SSE endpoint")
+    parser.add_argument("--database-url", help="benchmark against this database instead of a temp SQLite file")
+    parser.add_argument("--max-p95-ms", type=float, help="fail if p95 latency over all messages exceeds this")
+    args = parser.parse_args()
+
+    _configure(args)
+    p95 = asyncio.run(run(args))
+    if args.max_p95_ms is not None and p95 > args.max_p95_ms:
+        print(f"FAIL: p95 {p95:.1f} ms exceeds budget of {args.max_p95_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
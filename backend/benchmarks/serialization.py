@@ -0,0 +1,132 @@
+"""
+Task list serialization benchmark.
+
+Measures the CPU cost per row of turning ORM task rows into a JSON response
+body, without a database or HTTP round trip:
+
+- model_validate: ORM row -> TaskResponse one row at a time, through
+                  SQLAlchemy's instrumented attributes
+- task_responses: the whole list in one pydantic-core call, from each
+                  loaded row's __dict__
+- response_model: FastAPI's response_model path (validate the returned models
+                  again, dump them to JSON-compatible data, json.dumps)
+- model_response: ModelResponse (one pydantic-core dump of the validated models)
+
+"before" is model_validate + response_model, "after" is task_responses +
+model_response. Both paths are checked to produce byte-identical bodies.
+
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --rows 200 --repeat 200
+    python -m benchmarks.serialization --description-length 1000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+
+def _configure() -> None:
+    # Settings are read at import time; no connection is ever opened
+    db_file = os.path.join(tempfile.mkdtemp(), "bench_serialization.db")
+    os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{db_file}")
+
+
+def _make_rows(count: int, description_length: int):
+    from app.models.task import Task
+
+    owner_id = uuid.uuid4()
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        Task(
+            id=uuid.uuid4(),
+            title=f"Task {n}: review the quarterly report",
+            description=("Notes é " * description_length)[:description_length] or None,
+            completed=n % 3 == 0,
+            priority=("low", "medium", "high")[n % 3],
+            user_id=owner_id,
+            created_at=start + timedelta(seconds=n),
+            updated_at=start + timedelta(seconds=n, microseconds=n),
+        )
+        for n in range(count)
+    ]
+
+
+def _time(fn, repeat: int) -> float:
+    """Median seconds per call"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def run(args) -> None:
+    from typing import List
+
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+
+    from app.routers.tasks import router
+    from app.schemas.task import TaskResponse, task_responses
+    from app.utils.responses import ModelResponse
+
+    route = next(route for route in router.routes if route.path == "/tasks/search")
+    rows = _make_rows(args.rows, args.description_length)
+    items = [TaskResponse.model_validate(row) for row in rows]
+    loop = asyncio.new_event_loop()
+
+    def model_validate():
+        return [TaskResponse.model_validate(row) for row in rows]
+
+    def response_model():
+        content = loop.run_until_complete(serialize_response(field=route.response_field, response_content=items))
+        return JSONResponse(content).body
+
+    def model_response():
+        return ModelResponse(items, List[TaskResponse]).body
+
+    before, after = response_model(), model_response()
+    if before != after or task_responses(rows) != items:
+        print("FAIL: the fast path produced a different response")
+        sys.exit(1)
+
+    costs = {
+        "model_validate": _time(model_validate, args.repeat),
+        "task_responses": _time(lambda: task_responses(rows), args.repeat),
+        "response_model": _time(response_model, args.repeat),
+        "model_response": _time(model_response, args.repeat),
+    }
+    loop.close()
+    costs["before"] = costs["model_validate"] + costs["response_model"]
+    costs["after"] = costs["task_responses"] + costs["model_response"]
+
+    print(f"rows:               {args.rows} ({len(after) / args.rows:.0f} bytes each), median of {args.repeat} runs")
+    for name, seconds in costs.items():
+        print(f"{name + ':':<20}{seconds * 1e6 / args.rows:8.2f} us/row   {seconds * 1000:8.2f} ms/list")
+    print(f"speedup:            {costs['before'] / costs['after']:.1f}x end to end, "
+          f"{costs['model_validate'] / costs['task_responses']:.1f}x validation, "
+          f"{costs['response_model'] / costs['model_response']:.1f}x serialization")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000, help="tasks per serialized list")
+    parser.add_argument("--repeat", type=int, default=50, help="timed runs per path (the median is reported)")
+    parser.add_argument("--description-length", type=int, default=120, help="characters per description")
+    args = parser.parse_args()
+
+    _configure()
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
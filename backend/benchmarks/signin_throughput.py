@@ -0,0 +1,111 @@
+"""
+Signin throughput benchmark.
+
+Fires concurrent /auth/signin requests while a second set of clients polls
+GET /api/v1/tasks, and reports signin throughput alongside task endpoint
+latency. With password hashing on the event loop, task latency tracks the
+Argon2 cost; with the hashing pool it should stay flat.
+
+Runs in-process against a throwaway SQLite database; needs the development
+requirements (httpx):
+
+    pip install -r requirements-dev.txt
+
+    python -m benchmarks.signin_throughput --signins 200 --concurrency 16
+    python -m benchmarks.signin_throughput --inline   # old, blocking behaviour
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+_db_file = os.path.join(tempfile.mkdtemp(), "bench_signin.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_file}"
+
+import httpx  # noqa: E402
+
+from app.core import security  # noqa: E402
+from app.main import app, startup_event  # noqa: E402
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _inline(func, *args):
+    # Pre-change behaviour: hash directly on the event loop
+    return func(*args)
+
+
+async def run(signins: int, concurrency: int, pollers: int) -> None:
+    await startup_event()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        credentials = {"email": "bench@example.com", "password": "benchmark-password"}
+        response = await client.post(
+            "/auth/signup", json={**credentials, "username": "benchuser"}
+        )
+        response.raise_for_status()
+        response = await client.post("/auth/signin", json=credentials)
+        response.raise_for_status()
+        # Task endpoints only serve the signed-in user's tasks
+        client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+        await client.post("/api/v1/tasks", json={"title": "Benchmark task"})
+
+        done = asyncio.Event()
+        task_latencies = []
+
+        async def poll_tasks():
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get("/api/v1/tasks")
+                task_latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.005)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def signin():
+            async with semaphore:
+                response = await client.post("/auth/signin", json=credentials)
+                response.raise_for_status()
+
+        poll_jobs = [asyncio.create_task(poll_tasks()) for _ in range(pollers)]
+        start = time.perf_counter()
+        await asyncio.gather(*(signin() for _ in range(signins)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await asyncio.gather(*poll_jobs)
+
+    print(f"hashing:            {'inline (event loop)' if security._run_in_hash_pool is _inline else 'thread pool'}")
+    print(f"signins:            {signins} in {elapsed:.2f}s ({signins / elapsed:.1f}/s)")
+    if task_latencies:
+        ms = [sample * 1000 for sample in task_latencies]
+        print(f"task GETs served:   {len(ms)}")
+        print(f"task latency p50:   {statistics.median(ms):.1f} ms")
+        print(f"task latency p99:   {_percentile(ms, 99):.1f} ms")
+        print(f"task latency max:   {max(ms):.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--signins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--pollers", type=int, default=4)
+    parser.add_argument("--inline", action="store_true", help="hash on the event loop for comparison")
+    args = parser.parse_args()
+
+    if args.inline:
+        security._run_in_hash_pool = _inline
+    asyncio.run(run(args.signins, args.concurrency, args.pollers))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,168 +1,290 @@
 import re
 import asyncio
-from typing import Dict, Any
+from typing import Dict, Any, Optional, AsyncIterator, Tuple
+from uuid import UUID
+from app.core.settings import settings
+from app.utils.exceptions import LLMUnavailableException
 from .gemini_client import get_gemini_client
+from .intent_parser import parse_intent
+from .task_context import task_context
+from .tools.session import tool_scope
 
-async def get_gemini_response(prompt: str) -> str:
+def _parse_action(gemini_response: str) -> Dict[str, str]:
+    """Split an "ACTION:...|KEY:value" reply into a dict"""
+    action_dict = {}
+    for part in gemini_response.split("|"):
+        if ":" in part:
+            key, value = part.split(":", 1)
+            action_dict[key] = value
+    return action_dict
+
+_ACTION_PREFIX = "ACTION:"
+_GENERAL_PREFIX = "ACTION:general|RESPONSE:"
+
+def _task_context(owner_id: UUID, prompt: str) -> Optional[Dict[str, Any]]:
+    """The user's tasks most relevant to the prompt, within the context token budget"""
+    try:
+        return task_context.build(owner_id, prompt)
+    except Exception:
+        # Gemini can still answer without task context
+        return None
+
+async def get_gemini_response(prompt: str, owner_id: UUID) -> str:
     """
     Get a response from the actual Gemini API based on the provided prompt.
     The function will use tools as needed to interact with the todo app.
 
+    Plain commands ("Add task: X", "Show my tasks", ...) are recognized
+    locally and dispatched without calling Gemini.
+
     Args:
         prompt: The user's input/prompt
+        owner_id: The user whose tasks the tools act on
 
     Returns:
         The response as a string
     """
     try:
-        # Get the current tasks to provide context to Gemini
-        from .tools.read_tasks import read_tasks
-        tasks_result = await read_tasks()
-        context = None
-        if tasks_result["success"]:
-            context = {
-                "available_tasks": [task["title"] for task in tasks_result["tasks"]],
-                "total_tasks": len(tasks_result["tasks"])
-            }
+        gemini_response = None
 
-        # Get response from the actual Gemini API
-        gemini_client = get_gemini_client()
-        gemini_response = await gemini_client.generate_response(prompt, context)
-
-        # Parse the response to determine if it's a command or general response
-        if gemini_response.startswith("ACTION:"):
-            # Parse the action from Gemini's response
-            parts = gemini_response.split("|")
-            action_dict = {}
-            for part in parts:
-                if ":" in part:
-                    key, value = part.split(":", 1)
-                    action_dict[key] = value
-
-            action = action_dict.get("ACTION")
-
-            if action == "add_task":
-                title = action_dict.get("TITLE", "").strip('"\'')
-                from .tools.add_task import add_task
-                result = await add_task(title=title)
-                if result["success"]:
-                    return f"Okay, I've added \"{title}\" to your task list."
-                else:
-                    return f"Sorry, I couldn't add the task: {result['error']}"
-
-            elif action == "update_task":
-                old_title = action_dict.get("OLD_TITLE", "").strip('"\'')
-                new_title = action_dict.get("NEW_TITLE", "").strip('"\'')
-
-                # Find the task by title first
-                from .tools.read_tasks import read_tasks
-                read_result = await read_tasks()
-
-                if read_result["success"]:
-                    target_task = None
-                    for task in read_result["tasks"]:
-                        if task["title"].lower() == old_title.lower():
-                            target_task = task
-                            break
-
-                    if target_task:
-                        from .tools.update_task import update_task
-                        update_result = await update_task(
-                            task_id=target_task["id"],
-                            title=new_title
-                        )
-
-                        if update_result["success"]:
-                            return f"Okay, I've updated the task from '{old_title}' to '{new_title}'."
-                        else:
-                            return f"Sorry, I couldn't update the task: {update_result['error']}"
-                    else:
-                        return f"I couldn't find a task with the title '{old_title}'."
-                else:
-                    return f"Sorry, I couldn't retrieve your tasks to find the one to update: {read_result['error']}"
-
-            elif action == "delete_task":
-                title = action_dict.get("TITLE", "").strip('"\'')
-
-                # Find the task by title first
-                from .tools.read_tasks import read_tasks
-                read_result = await read_tasks()
-
-                if read_result["success"]:
-                    target_task = None
-                    for task in read_result["tasks"]:
-                        if task["title"].lower() == title.lower():
-                            target_task = task
-                            break
-
-                    if target_task:
-                        from .tools.delete_task import delete_task
-                        delete_result = await delete_task(task_id=target_task["id"])
-
-                        if delete_result["success"]:
-                            return f"Okay, I've deleted the task '{title}'."
-                        else:
-                            return f"Sorry, I couldn't delete the task: {delete_result['error']}"
-                    else:
-                        return f"I couldn't find a task with the title '{title}'."
-                else:
-                    return f"Sorry, I couldn't retrieve your tasks to find the one to delete: {read_result['error']}"
-
-            elif action == "complete_task":
-                title = action_dict.get("TITLE", "").strip('"\'')
-
-                # Find the task by title first
-                from .tools.read_tasks import read_tasks
-                read_result = await read_tasks()
-
-                if read_result["success"]:
-                    target_task = None
-                    for task in read_result["tasks"]:
-                        if task["title"].lower() == title.lower():
-                            target_task = task
-                            break
-
-                    if target_task:
-                        from .tools.complete_task import complete_task
-                        complete_result = await complete_task(task_id=target_task["id"])
-
-                        if complete_result["success"]:
-                            task_title = complete_result["task"]["title"]
-                            new_status = "completed" if complete_result["task"]["completed"] else "marked as incomplete"
-                            return f"Okay, I've {new_status} the task '{task_title}'."
-                        else:
-                            return f"Sorry, I couldn't update the task completion status: {complete_result['error']}"
-                    else:
-                        return f"I couldn't find a task with the title '{title}'."
-                else:
-                    return f"Sorry, I couldn't retrieve your tasks to find the one to mark as completed: {read_result['error']}"
-
-            elif action == "list_tasks":
-                if tasks_result["success"]:
-                    if tasks_result["count"] == 0:
-                        return "You don't have any tasks right now."
-                    else:
-                        task_list = "\n".join([f"- {task['title']}" for task in tasks_result["tasks"]])
-                        return f"Here are your tasks:\n{task_list}"
-                else:
-                    return f"Sorry, I couldn't retrieve your tasks: {tasks_result['error']}"
-
-            elif action == "general":
-                return action_dict.get("RESPONSE", "I processed your request.")
+        # Try the deterministic fast path before going to the LLM
+        action_dict = parse_intent(prompt) if settings.chat_fast_path_enabled else None
+
+        if action_dict is None:
+            # Fail fast while Gemini's circuit is open, before loading context
+            gemini_client = get_gemini_client()
+            gemini_client.guard.ensure_available()
+
+            # Only the tasks relevant to the message go into the prompt
+            context = _task_context(owner_id, prompt)
+
+            # Get response from the actual Gemini API
+            gemini_response = await gemini_client.generate_response(prompt, context)
 
-            else:
-                # If Gemini returned an unrecognized action, return its response directly
-                return gemini_response
-        else:
             # If Gemini didn't return an ACTION format, return its response directly
-            return gemini_response
+            if not gemini_response.startswith("ACTION:"):
+                return gemini_response
+
+            action_dict = _parse_action(gemini_response)
 
+        # Tool calls share one lazily opened session and memoized reads
+        async with tool_scope(owner_id):
+            return await _execute_action(action_dict, gemini_response)
+
+    except LLMUnavailableException:
+        raise
     except Exception as e:
         return f"Error processing request: {str(e)}"
 
+async def stream_gemini_response(prompt: str, owner_id: UUID) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Stream the agent's reply as (event, data) pairs
+
+    Events:
+        token: {"text"} - a chunk of conversational text as Gemini produces it
+        action: {"action", "params", "source"} - a tool is about to run
+        result: {"response"} - the outcome of the tool
+        error: {"detail", "retry_after"?} - processing failed; no more events
+            follow. retry_after is set when Gemini is unavailable
+        done: {"response"} - the full reply, always the last event on success
+
+    Conversational replies (plain text or ACTION:general) are forwarded token
+    by token. Other ACTION directives are buffered until complete, since they
+    are short and can't be run before their parameters are known.
+
+    Args:
+        prompt: The user's input/prompt
+        owner_id: The user whose tasks the tools act on
+    """
+    try:
+        action_dict = parse_intent(prompt) if settings.chat_fast_path_enabled else None
+        if action_dict is not None:
+            yield "action", _action_event(action_dict, "fast_path")
+            async with tool_scope(owner_id):
+                response = await _execute_action(action_dict)
+            yield "result", {"response": response}
+            yield "done", {"response": response}
+            return
+
+        gemini_client = get_gemini_client()
+        gemini_client.guard.ensure_available()
+        context = _task_context(owner_id, prompt)
+
+        # None until the reply is known to be text, a general reply or a tool action
+        mode = None
+        buffer = ""
+        streamed = []
+        async for chunk in gemini_client.stream_response(prompt, context):
+            if mode in ("text", "general"):
+                streamed.append(chunk)
+                yield "token", {"text": chunk}
+                continue
+
+            buffer += chunk
+            head = buffer.lstrip()
+            if mode is None:
+                if _ACTION_PREFIX.startswith(head):
+                    continue
+                if not head.startswith(_ACTION_PREFIX):
+                    mode = "text"
+                    streamed.append(buffer)
+                    yield "token", {"text": buffer}
+                    continue
+                mode = "action"
+
+            if head.startswith(_GENERAL_PREFIX):
+                mode = "general"
+                yield "action", _action_event({"ACTION": "general"}, "llm")
+                rest = head[len(_GENERAL_PREFIX):]
+                if rest:
+                    streamed.append(rest)
+                    yield "token", {"text": rest}
+
+        if mode == "action":
+            action_dict = _parse_action(buffer.lstrip())
+            yield "action", _action_event(action_dict, "llm")
+            async with tool_scope(owner_id):
+                response = await _execute_action(action_dict, buffer)
+            yield "result", {"response": response}
+        elif mode is None:
+            response = buffer
+            if buffer:
+                yield "token", {"text": buffer}
+        else:
+            response = "".join(streamed)
+
+        yield "done", {"response": response}
+
+    except LLMUnavailableException as e:
+        yield "error", {"detail": e.message, "retry_after": e.retry_after}
+    except Exception as e:
+        yield "error", {"detail": f"Error processing request: {str(e)}"}
+
+def _action_event(action_dict: Dict[str, str], source: str) -> Dict[str, Any]:
+    """Describe a parsed action for an "action" stream event"""
+    params = {key.lower(): value for key, value in action_dict.items() if key != "ACTION"}
+    return {"action": action_dict.get("ACTION"), "params": params, "source": source}
+
+def _not_found_reply(title: str, find_result: Dict[str, Any]) -> str:
+    """Reply for a title lookup that found no single task to act on"""
+    candidates = find_result.get("candidates")
+    if candidates:
+        options = ", ".join(f"'{candidate}'" for candidate in candidates)
+        return f"Several tasks match '{title}': {options}. Which one did you mean?"
+    return f"I couldn't find a task with the title '{title}'."
+
+async def _execute_action(
+    action_dict: Dict[str, str],
+    gemini_response: Optional[str] = None,
+) -> str:
+    """
+    Run the tool behind a parsed action and phrase the result for the user
+
+    Args:
+        action_dict: The parsed action, from Gemini or the fast-path parser
+        gemini_response: The raw Gemini reply, returned for unknown actions
+
+    Returns:
+        The response as a string
+    """
+    action = action_dict.get("ACTION")
+
+    if action == "add_task":
+        title = action_dict.get("TITLE", "").strip('"\'')
+        from .tools.add_task import add_task
+        result = await add_task(title=title)
+        if result["success"]:
+            return f"Okay, I've added \"{title}\" to your task list."
+        else:
+            return f"Sorry, I couldn't add the task: {result['error']}"
+
+    elif action == "update_task":
+        old_title = action_dict.get("OLD_TITLE", "").strip('"\'')
+        new_title = action_dict.get("NEW_TITLE", "").strip('"\'')
+
+        # Find the task with an indexed title lookup
+        from .tools.read_tasks import find_task_by_title
+        find_result = await find_task_by_title(old_title, fuzzy=True)
+
+        if find_result["success"]:
+            target_task = find_result["task"]
+            from .tools.update_task import update_task
+            update_result = await update_task(
+                task_id=target_task["id"],
+                title=new_title
+            )
+
+            if update_result["success"]:
+                return f"Okay, I've updated the task from '{target_task['title']}' to '{new_title}'."
+            else:
+                return f"Sorry, I couldn't update the task: {update_result['error']}"
+        else:
+            return _not_found_reply(old_title, find_result)
+
+    elif action == "delete_task":
+        title = action_dict.get("TITLE", "").strip('"\'')
+
+        # Find the task with an indexed title lookup; deletes only
+        # act on an exact (case-insensitive) title match
+        from .tools.read_tasks import find_task_by_title
+        find_result = await find_task_by_title(title)
+
+        if find_result["success"]:
+            target_task = find_result["task"]
+            from .tools.delete_task import delete_task
+            delete_result = await delete_task(task_id=target_task["id"])
+
+            if delete_result["success"]:
+                return f"Okay, I've deleted the task '{target_task['title']}'."
+            else:
+                return f"Sorry, I couldn't delete the task: {delete_result['error']}"
+        else:
+            return f"I couldn't find a task with the title '{title}'."
+
+    elif action == "complete_task":
+        title = action_dict.get("TITLE", "").strip('"\'')
+
+        # Find the task with an indexed title lookup
+        from .tools.read_tasks import find_task_by_title
+        find_result = await find_task_by_title(title, fuzzy=True)
+
+        if find_result["success"]:
+            target_task = find_result["task"]
+            from .tools.complete_task import complete_task
+            complete_result = await complete_task(task_id=target_task["id"])
+
+            if complete_result["success"]:
+                task_title = complete_result["task"]["title"]
+                new_status = "completed" if complete_result["task"]["completed"] else "marked as incomplete"
+                return f"Okay, I've {new_status} the task '{task_title}'."
+            else:
+                return f"Sorry, I couldn't update the task completion status: {complete_result['error']}"
+        else:
+            return _not_found_reply(title, find_result)
+
+    elif action == "list_tasks":
+        from .tools.read_tasks import read_tasks
+        tasks_result = await read_tasks()
+        if tasks_result["success"]:
+            if tasks_result["count"] == 0:
+                return "You don't have any tasks right now."
+            else:
+                task_list = "\n".join([f"- {task['title']}" for task in tasks_result["tasks"]])
+                return f"Here are your tasks:\n{task_list}"
+        else:
+            return f"Sorry, I couldn't retrieve your tasks: {tasks_result['error']}"
+
+    elif action == "general":
+        return action_dict.get("RESPONSE", "I processed your request.")
+
+    else:
+        # If Gemini returned an unrecognized action, return its response directly
+        return gemini_response
+
 if __name__ == "__main__":
-    # Example usage
+    # Example usage: python -m mcp.agent <user id>
+    import sys
     user_input = "Add a new task: Buy groceries"
-    response = asyncio.run(get_gemini_response(user_input))
+    response = asyncio.run(get_gemini_response(user_input, UUID(sys.argv[1])))
     print(f"User: {user_input}")
     print(f"Assistant: {response}")
\ No newline at end of file
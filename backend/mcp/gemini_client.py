@@ -1,18 +1,70 @@
 import os
-import google.generativeai as genai
+import asyncio
+from google.api_core import exceptions as google_exceptions
 from app.core.settings import settings
-from typing import Dict, Any, Optional
+from app.utils.exceptions import LLMUnavailableException
+from typing import Dict, Any, Optional, AsyncIterator
+from .llm_backends import LLMBackend, build_llm_backend
+from .resilience import CircuitBreaker, ResilientCaller
+from .response_cache import build_response_cache, make_cache_key
+
+# Upstream errors worth retrying; anything else is a problem with the request
+_TRANSIENT_ERRORS = (
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.TooManyRequests,
+    google_exceptions.InternalServerError,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.GatewayTimeout,
+)
 
 class GeminiClient:
-    def __init__(self):
-        # Initialize the Gemini API with the key from settings
-        api_key = settings.gemini_api_key
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY not found in settings")
+    def __init__(self, backend: Optional[LLMBackend] = None):
+        # The model is Gemini unless settings.llm_backend selects the offline fake
+        self.backend = backend or build_llm_backend()
+
+        # Identical prompts against an unchanged task list reuse earlier answers
+        self.response_cache = build_response_cache()
+
+        # Concurrency cap, timeouts, retries and circuit breaker for API calls
+        self.guard = ResilientCaller(
+            max_concurrency=settings.llm_max_concurrency,
+            queue_timeout=settings.llm_queue_timeout_seconds,
+            call_timeout=settings.llm_request_timeout_seconds,
+            max_retries=settings.llm_max_retries,
+            retry_base_delay=settings.llm_retry_base_delay_seconds,
+            breaker=CircuitBreaker(
+                failure_threshold=settings.llm_circuit_failure_threshold,
+                reset_timeout=settings.llm_circuit_reset_seconds,
+            ),
+            retryable=_TRANSIENT_ERRORS,
+        )
+
+    def _build_prompt(self, prompt: str, context: Optional[Dict[str, Any]] = None) -> str:
+        """Wrap the user's input in the instructions describing the ACTION format"""
+        # Prepare the full prompt with context if available
+        full_prompt = f"""
+        You are an AI assistant for a todo application. The user can ask you to:
+        - Add tasks: "Add task: [task title]"
+        - Update tasks: "Update task '[old title]' to '[new title]'"
+        - Delete tasks: "Delete task '[task title]'"
+        - Complete tasks: "Complete task '[task title]'"
+        - List tasks: "Show my tasks"
+
+        For these operations, respond with a JSON-like format indicating the action:
+        - For adding: "ACTION:add_task|TITLE:[task title]"
+        - For updating: "ACTION:update_task|OLD_TITLE:[old title]|NEW_TITLE:[new title]"
+        - For deleting: "ACTION:delete_task|TITLE:[task title]"
+        - For completing: "ACTION:complete_task|TITLE:[task title]"
+        - For listing: "ACTION:list_tasks"
+        - For general chat: "ACTION:general|RESPONSE:[your response]"
+
+        Current user input: {prompt}
+        """
 
-        genai.configure(api_key=api_key)
-        # Use gemini-2.5-flash which is available and supports generateContent
-        self.model = genai.GenerativeModel('models/gemini-2.5-flash')
+        if context:
+            full_prompt += f"\n\nAdditional context: {context}"
+
+        return full_prompt
 
     async def generate_response(self, prompt: str, context: Optional[Dict[str, Any]] = None) -> str:
         """
@@ -24,40 +76,96 @@ class GeminiClient:
 
         Returns:
             The response as a string
+
+        Raises:
+            LLMUnavailableException: Gemini is overloaded, timing out or its circuit is open
         """
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = make_cache_key(prompt, context)
+            cached_response = await self.response_cache.get(cache_key)
+            if cached_response is not None:
+                return cached_response
+
         try:
-            # Prepare the full prompt with context if available
-            full_prompt = f"""
-            You are an AI assistant for a todo application. The user can ask you to:
-            - Add tasks: "Add task: [task title]"
-            - Update tasks: "Update task '[old title]' to '[new title]'"
-            - Delete tasks: "Delete task '[task title]'"
-            - Complete tasks: "Complete task '[task title]'"
-            - List tasks: "Show my tasks"
-
-            For these operations, respond with a JSON-like format indicating the action:
-            - For adding: "ACTION:add_task|TITLE:[task title]"
-            - For updating: "ACTION:update_task|OLD_TITLE:[old title]|NEW_TITLE:[new title]"
-            - For deleting: "ACTION:delete_task|TITLE:[task title]"
-            - For completing: "ACTION:complete_task|TITLE:[task title]"
-            - For listing: "ACTION:list_tasks"
-            - For general chat: "ACTION:general|RESPONSE:[your response]"
-
-            Current user input: {prompt}
-            """
-
-            if context:
-                full_prompt += f"\n\nAdditional context: {context}"
+            full_prompt = self._build_prompt(prompt, context)
 
             # Generate content using the Gemini API
-            response = await self.model.generate_content_async(full_prompt)
+            response_text = await self.guard.call(lambda: self.backend.generate(full_prompt))
+
+            if not response_text:
+                return "I couldn't process that request."
+
+            # Only successful completions are cached
+            if cache_key is not None:
+                await self.response_cache.set(cache_key, response_text)
 
             # Return the text response
-            return response.text if response.text else "I couldn't process that request."
+            return response_text
 
+        except LLMUnavailableException:
+            raise
         except Exception as e:
             return f"Error communicating with Gemini API: {str(e)}"
 
+    async def stream_response(self, prompt: str, context: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """
+        Stream a response from the Gemini API as text chunks arrive
+
+        Args:
+            prompt: The user's input/prompt
+            context: Additional context about tasks, etc.
+
+        Yields:
+            Text chunks of the response; a cached response is yielded whole.
+            API errors propagate to the caller; transient ones, stalls longer
+            than the request timeout and an open circuit raise
+            LLMUnavailableException.
+        """
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = make_cache_key(prompt, context)
+            cached_response = await self.response_cache.get(cache_key)
+            if cached_response is not None:
+                yield cached_response
+                return
+
+        full_prompt = self._build_prompt(prompt, context)
+
+        # The slot is held for the whole stream; only opening the stream is
+        # retried, since chunks already forwarded can't be taken back
+        self.guard.ensure_available()
+        chunks = []
+        async with self.guard.slot():
+            iterator = await self.guard.attempt(lambda: self.backend.stream(full_prompt))
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(iterator.__anext__(), self.guard.call_timeout)
+                except StopAsyncIteration:
+                    break
+                except Exception as e:
+                    if not self.guard.is_transient(e):
+                        raise
+                    self.guard.failures += 1
+                    raise self.guard.transient_failure(e, "The language model stream failed") from e
+                if chunk:
+                    chunks.append(chunk)
+                    yield chunk
+
+        # Only complete, successful completions are cached
+        if chunks and cache_key is not None:
+            await self.response_cache.set(cache_key, "".join(chunks))
+
+    def guard_stats(self) -> Dict[str, Any]:
+        """Concurrency, retry and circuit breaker metrics"""
+        return {"backend": self.backend.name, **self.guard.stats()}
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss metrics of the response cache"""
+        if self.response_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.response_cache.stats()}
+
 # Global instance
 gemini_client = None
 
@@ -0,0 +1,123 @@
+import re
+from threading import Lock
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+
+# Rule-based recognizer for the command grammar the Gemini prompt teaches.
+# Only unambiguous phrasings are matched: a title must either follow a colon
+# or be quoted. Anything else returns None and goes to Gemini.
+
+_QUOTED = r"""["'“‘](?P<{name}>.+?)["'”’]"""
+
+
+def _title(name: str = "title") -> str:
+    """A quoted title, or the rest of the message after a colon"""
+    quoted = _QUOTED.format(name=name)
+    return rf"(?:\s*:\s*(?P<{name}_c>.+?)|\s+{quoted})"
+
+
+_POLITE = r"(?:(?:please|can\s+you|could\s+you)\s+)?"
+_END = r"\s*[.!?]?\s*$"
+
+
+def _rule(pattern: str) -> Pattern[str]:
+    return re.compile(rf"^\s*{_POLITE}{pattern}{_END}", re.IGNORECASE)
+
+
+_RULES: List[Tuple[str, Pattern[str]]] = [
+    ("add_task", _rule(rf"(?:add|create)(?:\s+an?)?(?:\s+new)?\s+task{_title()}")),
+    ("delete_task", _rule(rf"(?:delete|remove)(?:\s+the)?\s+task{_title()}")),
+    (
+        "complete_task",
+        _rule(rf"(?:complete|finish|mark)(?:\s+the)?\s+task{_title()}(?:\s+as\s+(?:done|complete|completed))?"),
+    ),
+    (
+        "update_task",
+        _rule(
+            rf"(?:update|rename|change)(?:\s+the)?\s+task\s+{_QUOTED.format(name='old_title')}"
+            rf"\s+(?:to|into|as)\s+{_QUOTED.format(name='new_title')}"
+        ),
+    ),
+    (
+        "list_tasks",
+        _rule(
+            r"(?:(?:show|list|display|view|get)(?:\s+me)?(?:\s+all)?(?:\s+of)?(?:\s+my|\s+the)?\s+tasks"
+            r"|what\s+are\s+my\s+tasks|my\s+tasks)"
+        ),
+    ),
+]
+
+
+def _group(match: "re.Match[str]", name: str) -> Optional[str]:
+    """Value of a title group, whichever of its quoted/colon variants matched"""
+    for key in (name, f"{name}_c"):
+        value = match.groupdict().get(key)
+        if value:
+            return value.strip()
+    return None
+
+
+class IntentStats:
+    """Counts how many chat messages the fast path resolved locally"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.fast_path_hits = 0
+        self.llm_fallbacks = 0
+        self.by_action: Dict[str, int] = {}
+
+    def record(self, action: Optional[str]) -> None:
+        with self._lock:
+            if action is None:
+                self.llm_fallbacks += 1
+            else:
+                self.fast_path_hits += 1
+                self.by_action[action] = self.by_action.get(action, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.fast_path_hits + self.llm_fallbacks
+            return {
+                "fast_path_hits": self.fast_path_hits,
+                "llm_fallbacks": self.llm_fallbacks,
+                "hit_ratio": self.fast_path_hits / total if total else 0.0,
+                "by_action": dict(self.by_action),
+            }
+
+
+intent_stats = IntentStats()
+
+
+def parse_intent(message: str) -> Optional[Dict[str, str]]:
+    """
+    Recognize a chat message as one of the agent's actions without calling the LLM
+
+    Args:
+        message: The user's chat message
+
+    Returns:
+        An action dict in the same shape as a parsed Gemini "ACTION:" reply
+        (e.g. {"ACTION": "add_task", "TITLE": "Buy milk"}), or None when the
+        message is not an unambiguous command
+    """
+    for action, pattern in _RULES:
+        match = pattern.match(message)
+        if not match:
+            continue
+
+        if action == "list_tasks":
+            result = {"ACTION": action}
+        elif action == "update_task":
+            result = {
+                "ACTION": action,
+                "OLD_TITLE": _group(match, "old_title"),
+                "NEW_TITLE": _group(match, "new_title"),
+            }
+        else:
+            result = {"ACTION": action, "TITLE": _group(match, "title")}
+
+        if all(result.values()):
+            intent_stats.record(action)
+            return result
+
+    intent_stats.record(None)
+    return None
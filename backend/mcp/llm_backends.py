@@ -0,0 +1,179 @@
+import asyncio
+import random
+import re
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Optional
+
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+
+from app.core.settings import settings
+
+
+class LLMBackend(ABC):
+    """Interface for the model behind the chat agent"""
+
+    name = "base"
+
+    @abstractmethod
+    async def generate(self, prompt: str) -> str:
+        """Return the full completion for a prompt"""
+
+    @abstractmethod
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Open a streamed completion
+
+        Awaiting this returns an async iterator of text chunks, so opening the
+        stream can be retried separately from consuming it.
+        """
+
+
+class GeminiBackend(LLMBackend):
+    """The real Gemini API"""
+
+    name = "gemini"
+
+    # gemini-2.5-flash is available and supports generateContent
+    def __init__(self, api_key: str, model_name: str = "models/gemini-2.5-flash", api_endpoint: Optional[str] = None):
+        client_options = None
+        if api_endpoint:
+            # e.g. a proxy in front of the API
+            client_options = {"api_endpoint": api_endpoint}
+        genai.configure(api_key=api_key, client_options=client_options)
+        self.model = genai.GenerativeModel(model_name)
+
+    async def generate(self, prompt: str) -> str:
+        response = await self.model.generate_content_async(prompt)
+        return response.text
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        response = await self.model.generate_content_async(prompt, stream=True)
+
+        async def chunks() -> AsyncIterator[str]:
+            async for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+
+        return chunks()
+
+
+class FakeLLMBackend(LLMBackend):
+    """
+    Deterministic offline stand-in for Gemini
+
+    Maps the user input embedded in the agent prompt to the same ACTION
+    strings Gemini is asked to produce, using keyword rules. Latency is
+    sampled from a seeded distribution so runs are reproducible:
+
+    - constant: always ``latency_ms``
+    - uniform: between 0 and 2 * ``latency_ms``
+    - exponential: mean ``latency_ms``
+    - lognormal: median ``latency_ms`` with a heavy tail
+
+    ``error_rate`` makes that fraction of calls fail with ServiceUnavailable,
+    which exercises the retry and circuit breaker paths.
+    """
+
+    name = "fake"
+
+    _USER_INPUT = re.compile(r"Current user input: (.*?)\n", re.DOTALL)
+    _DISTRIBUTIONS = ("constant", "uniform", "exponential", "lognormal")
+
+    def __init__(
+        self,
+        latency_ms: float = 50.0,
+        distribution: str = "constant",
+        chunk_delay_ms: float = 5.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        if distribution not in self._DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.latency_ms = latency_ms
+        self.distribution = distribution
+        self.chunk_delay_ms = chunk_delay_ms
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+
+    def _latency(self) -> float:
+        """Sample one call's latency in seconds"""
+        mean = self.latency_ms / 1000
+        if self.distribution == "uniform":
+            return self._random.uniform(0, 2 * mean)
+        if self.distribution == "exponential":
+            return self._random.expovariate(1 / mean) if mean > 0 else 0.0
+        if self.distribution == "lognormal":
+            return self._random.lognormvariate(0, 0.75) * mean
+        return mean
+
+    @staticmethod
+    def _title(words: str) -> str:
+        """Strip filler between the verb and the task title"""
+        title = re.sub(r"^(?:(?:a|an|the|new|task|to)\s+)*", "", words.strip(), flags=re.IGNORECASE)
+        return title.lstrip(":").strip().strip("\"'.!?")
+
+    def respond(self, prompt: str) -> str:
+        """The ACTION string this fake answers a prompt with"""
+        match = self._USER_INPUT.search(prompt)
+        text = (match.group(1) if match else prompt).strip()
+        lowered = text.lower()
+
+        if lowered.startswith(("show", "list", "what")):
+            return "ACTION:list_tasks"
+        rename = re.search(r"(?:update|rename|change)\s+(.+?)\s+(?:to|into)\s+(.+)", text, re.IGNORECASE)
+        if rename:
+            return f"ACTION:update_task|OLD_TITLE:{self._title(rename.group(1))}|NEW_TITLE:{self._title(rename.group(2))}"
+        for verbs, action in (
+            (("delete", "remove", "drop"), "delete_task"),
+            (("complete", "finish", "done with", "mark"), "complete_task"),
+            (("add", "create", "remember", "remind me", "i need", "i have"), "add_task"),
+        ):
+            for verb in verbs:
+                position = lowered.find(verb)
+                if position != -1:
+                    title = self._title(text[position + len(verb):])
+                    if title:
+                        return f"ACTION:{action}|TITLE:{title}"
+        if "tasks" in lowered:
+            return "ACTION:list_tasks"
+        return f"ACTION:general|RESPONSE:This is a test reply to: {text}"
+
+    async def _delay(self) -> None:
+        await asyncio.sleep(self._latency())
+        if self.error_rate and self._random.random() < self.error_rate:
+            raise google_exceptions.ServiceUnavailable("Fake backend failure")
+
+    async def generate(self, prompt: str) -> str:
+        await self._delay()
+        return self.respond(prompt)
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        await self._delay()
+        text = self.respond(prompt)
+
+        async def chunks() -> AsyncIterator[str]:
+            for start in range(0, len(text), 16):
+                if start and self.chunk_delay_ms:
+                    await asyncio.sleep(self.chunk_delay_ms / 1000)
+                yield text[start:start + 16]
+
+        return chunks()
+
+
+def build_llm_backend() -> LLMBackend:
+    """Create the backend selected by settings.llm_backend"""
+    if settings.llm_backend == "fake":
+        return FakeLLMBackend(
+            latency_ms=settings.llm_fake_latency_ms,
+            distribution=settings.llm_fake_latency_distribution,
+            chunk_delay_ms=settings.llm_fake_chunk_delay_ms,
+            error_rate=settings.llm_fake_error_rate,
+            seed=settings.llm_fake_seed,
+        )
+    if settings.llm_backend != "gemini":
+        raise ValueError(f"Unknown LLM backend: {settings.llm_backend}")
+
+    if not settings.gemini_api_key:
+        raise ValueError("GEMINI_API_KEY not found in settings")
+    return GeminiBackend(settings.gemini_api_key, api_endpoint=settings.gemini_api_endpoint)
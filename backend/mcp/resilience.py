@@ -0,0 +1,214 @@
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Tuple, Type, TypeVar
+
+from app.utils.exceptions import LLMUnavailableException
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing upstream for a cool-down period
+
+    closed: calls flow; consecutive failures are counted.
+    open: calls fail immediately until ``reset_timeout`` has elapsed.
+    half_open: one probe call is let through; success closes the
+    circuit again, failure re-opens it. A probe that is abandoned
+    (cancelled) lets the next call probe instead.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self._probing = False
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a probe through (0 if calls may proceed)"""
+        if self.state != "open":
+            return 0.0
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def before_call(self) -> None:
+        """Raise LLMUnavailableException if the call must not be attempted"""
+        if self.state == "open":
+            remaining = self.retry_after()
+            if remaining > 0:
+                self.rejected += 1
+                raise LLMUnavailableException("The language model is temporarily unavailable", remaining)
+            self.state = "half_open"
+            self._probing = False
+
+        if self.state == "half_open":
+            if self._probing:
+                self.rejected += 1
+                raise LLMUnavailableException("The language model is recovering", self.reset_timeout)
+            self._probing = True
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._probing = False
+
+    def record_abandoned(self) -> None:
+        """A call ended without an answer either way (e.g. it was cancelled)"""
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._probing = False
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.warning("LLM circuit opened after %d consecutive failures", self.consecutive_failures)
+                self.times_opened += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "retry_after": round(self.retry_after(), 3),
+        }
+
+
+class ResilientCaller:
+    """
+    Guards calls to an unreliable upstream with:
+
+    - a concurrency limit; callers wait at most ``queue_timeout`` for a slot
+    - a per-attempt timeout
+    - retries with full-jitter exponential backoff for transient errors
+    - a circuit breaker that fails fast while the upstream is unhealthy
+
+    Rejections raise LLMUnavailableException carrying a Retry-After hint.
+    Non-transient errors (bad request, permission denied, ...) are raised
+    unchanged and don't count against the circuit.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        queue_timeout: float,
+        call_timeout: float,
+        max_retries: int,
+        retry_base_delay: float,
+        breaker: CircuitBreaker,
+        retryable: Tuple[Type[BaseException], ...] = (),
+    ):
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.call_timeout = call_timeout
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.breaker = breaker
+        self.retryable = (asyncio.TimeoutError,) + tuple(retryable)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+        self.queue_rejections = 0
+        self.timeouts = 0
+        self.retries = 0
+        self.failures = 0
+
+    def is_transient(self, error: BaseException) -> bool:
+        return isinstance(error, self.retryable)
+
+    def ensure_available(self) -> None:
+        """Fail fast if the circuit is open, without taking a slot"""
+        if self.breaker.state == "open" and self.breaker.retry_after() > 0:
+            self.breaker.rejected += 1
+            raise LLMUnavailableException("The language model is temporarily unavailable", self.breaker.retry_after())
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one of the concurrency slots, waiting at most queue_timeout"""
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.queue_rejections += 1
+            raise LLMUnavailableException("Too many chat requests in flight", max(1.0, self.queue_timeout))
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def transient_failure(self, error: BaseException, what: str) -> LLMUnavailableException:
+        """Count a transient upstream failure against the circuit and describe it"""
+        if isinstance(error, asyncio.TimeoutError):
+            self.timeouts += 1
+        self.breaker.record_failure()
+        return LLMUnavailableException(
+            f"{what}: {type(error).__name__}",
+            self.breaker.retry_after() or self.retry_base_delay,
+        )
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: uniform in [0, base * 2^attempt]
+        return random.uniform(0, self.retry_base_delay * (2 ** attempt))
+
+    async def attempt(self, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``call`` with timeout, retries and circuit breaking; the caller
+        must already hold a slot
+        """
+        for attempt in range(self.max_retries + 1):
+            self.breaker.before_call()
+            try:
+                result = await asyncio.wait_for(call(), self.call_timeout)
+            except Exception as e:
+                if not self.is_transient(e):
+                    # The upstream answered; the request itself was bad
+                    self.breaker.record_success()
+                    raise
+                unavailable = self.transient_failure(e, "The language model did not respond")
+                if attempt == self.max_retries or self.breaker.state == "open":
+                    self.failures += 1
+                    raise unavailable from e
+                self.retries += 1
+                await asyncio.sleep(self._backoff(attempt))
+            except BaseException:
+                # Cancelled: the upstream's health is still unknown, so don't
+                # leave a half-open circuit waiting on this probe forever
+                self.breaker.record_abandoned()
+                raise
+            else:
+                self.breaker.record_success()
+                return result
+        raise AssertionError("unreachable")
+
+    async def call(self, call: Callable[[], Awaitable[T]]) -> T:
+        """Take a slot and run ``call`` through attempt()"""
+        self.ensure_available()
+        async with self.slot():
+            return await self.attempt(call)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "queue_rejections": self.queue_rejections,
+            "timeouts": self.timeouts,
+            "retries": self.retries,
+            "failures": self.failures,
+            "circuit": self.breaker.stats(),
+        }
@@ -0,0 +1,159 @@
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+from app.core.settings import settings
+from app.utils.cache import TTLCache
+
+
+def make_cache_key(prompt: str, context: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Build a cache key from the normalized prompt and a fingerprint of the context
+
+    The context carries the user's task list, so any change to the tasks
+    produces a different key and stale answers are never served.
+    """
+    normalized_prompt = re.sub(r"\s+", " ", prompt).strip().lower()
+    context_json = json.dumps(context or {}, sort_keys=True, default=str, separators=(",", ":"))
+    context_hash = hashlib.sha256(context_json.encode()).hexdigest()
+    prompt_hash = hashlib.sha256(normalized_prompt.encode()).hexdigest()
+    return f"{prompt_hash}:{context_hash}"
+
+
+class ResponseCache(ABC):
+    """Interface for LLM response caches"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: str) -> None:
+        ...
+
+    @abstractmethod
+    async def clear(self) -> None:
+        ...
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class MemoryResponseCache(ResponseCache):
+    """In-process LRU cache with a TTL"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._cache: TTLCache[str] = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: str) -> None:
+        self._cache.set(key, value)
+
+    async def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+
+class SQLiteResponseCache(ResponseCache):
+    """On-disk cache in a local SQLite file, shared across restarts and workers"""
+
+    def __init__(self, path: str, ttl_seconds: float):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS llm_response_cache "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._lock = asyncio.Lock()
+
+    def _get(self, key: str) -> Optional[str]:
+        row = self._connection.execute(
+            "SELECT value FROM llm_response_cache WHERE key = ? AND expires_at > ?",
+            (key, time.time()),
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key: str, value: str) -> None:
+        now = time.time()
+        self._connection.execute(
+            "INSERT OR REPLACE INTO llm_response_cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, now + self.ttl_seconds),
+        )
+        self._connection.execute("DELETE FROM llm_response_cache WHERE expires_at <= ?", (now,))
+
+    async def get(self, key: str) -> Optional[str]:
+        async with self._lock:
+            value = await asyncio.to_thread(self._get, key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        async with self._lock:
+            await asyncio.to_thread(self._set, key, value)
+
+    async def clear(self) -> None:
+        async with self._lock:
+            await asyncio.to_thread(self._connection.execute, "DELETE FROM llm_response_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class TieredResponseCache(ResponseCache):
+    """Memory tier in front of a disk tier; disk hits are promoted to memory"""
+
+    def __init__(self, memory: ResponseCache, disk: ResponseCache):
+        self.memory = memory
+        self.disk = disk
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self.memory.get(key)
+        if value is None:
+            value = await self.disk.get(key)
+            if value is not None:
+                await self.memory.set(key, value)
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        await self.memory.set(key, value)
+        await self.disk.set(key, value)
+
+    async def clear(self) -> None:
+        await self.memory.clear()
+        await self.disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"memory": self.memory.stats(), "disk": self.disk.stats()}
+
+
+def build_response_cache() -> Optional[ResponseCache]:
+    """Create the response cache configured in settings, or None when disabled"""
+    if not settings.llm_cache_enabled:
+        return None
+    memory = MemoryResponseCache(settings.llm_cache_max_entries, settings.llm_cache_ttl_seconds)
+    if settings.llm_cache_path:
+        return TieredResponseCache(memory, SQLiteResponseCache(settings.llm_cache_path, settings.llm_cache_ttl_seconds))
+    return memory
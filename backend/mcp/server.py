@@ -0,0 +1,411 @@
+"""
+Model Context Protocol server exposing the task tools.
+
+Speaks JSON-RPC 2.0 over either transport:
+
+    python -m mcp.server --user alice@example.com                   # stdio, for local agents
+    python -m mcp.server --transport http --port 8765               # streamable HTTP at POST /mcp
+
+Tools only ever see one user's tasks. Over stdio that is the --user account
+(an id, email or username; MCP_USER in the environment); over HTTP it is the
+owner of the request's bearer access token, falling back to --user.
+
+The engine, its connection pool and the tool registry (with input schemas
+derived once from the tool signatures) live for the whole process, and
+every request is handled in its own task so tool calls run concurrently.
+"""
+import argparse
+import asyncio
+import inspect
+import json
+import logging
+import os
+import re
+import sys
+import time
+import typing
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+from uuid import UUID
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+
+from app.db.database import engine  # noqa: E402
+from app.repositories.task_cache import task_cache_listener  # noqa: E402
+from app.repositories.user_repository import UserRepository  # noqa: E402
+from mcp.tools import TOOLS  # noqa: E402
+from mcp.tools.session import tool_scope  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+SERVER_INFO = {"name": "todo-tasks", "version": "1.0.0"}
+PROTOCOL_VERSIONS = ("2025-06-18", "2025-03-26", "2024-11-05")
+
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+_JSON_TYPES = {str: "string", bool: "boolean", int: "integer", float: "number"}
+
+
+class RPCError(Exception):
+    def __init__(self, code: int, message: str):
+        self.code = code
+        self.message = message
+        super().__init__(message)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(message: Any) -> str:
+    return json.dumps(message, default=_json_default, separators=(",", ":"))
+
+
+@dataclass
+class Tool:
+    name: str
+    function: Callable[..., Awaitable[Dict[str, Any]]]
+    description: str
+    input_schema: Dict[str, Any]
+
+    def definition(self) -> Dict[str, Any]:
+        return {"name": self.name, "description": self.description, "inputSchema": self.input_schema}
+
+
+def _parse_docstring(docstring: str):
+    """Split a Google-style docstring into (summary, {arg: description})"""
+    summary = docstring.strip().split("\n\n", 1)[0].strip()
+    arguments = {}
+    section = re.search(r"Args:\n(.*?)(?:\n\s*\n|\Z)", docstring, re.DOTALL)
+    if section:
+        for line in section.group(1).splitlines():
+            match = re.match(r"\s*(\w+):\s*(.+)", line)
+            if match:
+                arguments[match.group(1)] = match.group(2).strip()
+    return summary, arguments
+
+
+def _schema_type(annotation: Any) -> Dict[str, Any]:
+    if typing.get_origin(annotation) is Union:
+        annotation = next(arg for arg in typing.get_args(annotation) if arg is not type(None))
+    return {"type": _JSON_TYPES.get(annotation, "string")}
+
+
+def build_tool(name: str, function: Callable[..., Awaitable[Dict[str, Any]]]) -> Tool:
+    """Describe a tool coroutine, deriving its JSON Schema from the signature"""
+    summary, argument_docs = _parse_docstring(inspect.getdoc(function) or name)
+    hints = typing.get_type_hints(function)
+    properties: Dict[str, Any] = {}
+    required: List[str] = []
+    for parameter in inspect.signature(function).parameters.values():
+        schema = _schema_type(hints.get(parameter.name, str))
+        if parameter.name in argument_docs:
+            schema["description"] = argument_docs[parameter.name]
+        properties[parameter.name] = schema
+        if parameter.default is inspect.Parameter.empty:
+            required.append(parameter.name)
+    input_schema = {"type": "object", "properties": properties, "additionalProperties": False}
+    if required:
+        input_schema["required"] = required
+    return Tool(name, function, summary, input_schema)
+
+
+async def resolve_user(identifier: str) -> UUID:
+    """Look up a user by id, email or username"""
+    async with AsyncSession(bind=engine) as session:
+        users = UserRepository(session)
+        try:
+            user = await users.get_user_by_id(UUID(identifier))
+        except ValueError:
+            if "@" in identifier:
+                user = await users.get_user_by_email(identifier)
+            else:
+                user = await users.get_user_by_username(identifier)
+    if user is None:
+        raise ValueError(f"No user matches {identifier!r}")
+    return user.id
+
+
+class MCPServer:
+    """Transport-independent MCP request handling"""
+
+    def __init__(
+        self,
+        tools: Dict[str, Callable[..., Awaitable[Dict[str, Any]]]],
+        owner_id: Optional[UUID] = None,
+    ):
+        self.tools = {name: build_tool(name, function) for name, function in tools.items()}
+        # The user tool calls act for when a request doesn't name one
+        self.owner_id = owner_id
+        self._tool_list = [tool.definition() for tool in self.tools.values()]
+        self.calls = 0
+        self.errors = 0
+
+    async def warm_up(self) -> None:
+        """Open a pooled connection up front so the first tool call doesn't pay for it"""
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+        # Tool reads are cached, so this process needs other replicas' invalidations
+        if task_cache_listener is not None:
+            await task_cache_listener.start()
+
+    async def close(self) -> None:
+        if task_cache_listener is not None:
+            await task_cache_listener.stop()
+        await engine.dispose()
+
+    async def handle(self, message: Any, owner_id: Optional[UUID] = None) -> Optional[Any]:
+        """
+        Handle one JSON-RPC message or batch; returns None for notifications
+
+        Tool calls act on owner_id's tasks, or the server's default user.
+        """
+        owner_id = owner_id or self.owner_id
+        if isinstance(message, list):
+            if not message:
+                return self._error(None, INVALID_REQUEST, "Empty batch")
+            responses = await asyncio.gather(*(self._handle_one(item, owner_id) for item in message))
+            return [response for response in responses if response is not None] or None
+        return await self._handle_one(message, owner_id)
+
+    async def _handle_one(self, message: Any, owner_id: Optional[UUID]) -> Optional[Dict[str, Any]]:
+        if not isinstance(message, dict):
+            return self._error(None, INVALID_REQUEST, "Invalid request")
+        if "method" not in message and ("result" in message or "error" in message):
+            # A response to a server request; this server never sends any
+            return None
+        if message.get("jsonrpc") != "2.0" or not isinstance(message.get("method"), str):
+            return self._error(message.get("id"), INVALID_REQUEST, "Invalid request")
+
+        request_id = message.get("id")
+        is_notification = "id" not in message
+        try:
+            result = await self._dispatch(message["method"], message.get("params") or {}, owner_id)
+        except RPCError as e:
+            return None if is_notification else self._error(request_id, e.code, e.message)
+        except Exception as e:
+            logger.exception("MCP request %s failed", message["method"])
+            return None if is_notification else self._error(request_id, INTERNAL_ERROR, str(e))
+        if is_notification:
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    async def _dispatch(self, method: str, params: Dict[str, Any], owner_id: Optional[UUID]) -> Any:
+        if method == "initialize":
+            requested = params.get("protocolVersion")
+            version = requested if requested in PROTOCOL_VERSIONS else PROTOCOL_VERSIONS[0]
+            return {
+                "protocolVersion": version,
+                "capabilities": {"tools": {"listChanged": False}},
+                "serverInfo": SERVER_INFO,
+            }
+        if method == "ping":
+            return {}
+        if method == "tools/list":
+            return {"tools": self._tool_list}
+        if method == "tools/call":
+            return await self._call_tool(params, owner_id)
+        if method.startswith("notifications/"):
+            return None
+        raise RPCError(METHOD_NOT_FOUND, f"Method not found: {method}")
+
+    async def _call_tool(self, params: Dict[str, Any], owner_id: Optional[UUID]) -> Dict[str, Any]:
+        tool = self.tools.get(params.get("name"))
+        if tool is None:
+            raise RPCError(INVALID_PARAMS, f"Unknown tool: {params.get('name')}")
+        arguments = params.get("arguments") or {}
+        if not isinstance(arguments, dict):
+            raise RPCError(INVALID_PARAMS, "arguments must be an object")
+        unknown = set(arguments) - set(tool.input_schema["properties"])
+        missing = set(tool.input_schema.get("required", ())) - set(arguments)
+        if unknown or missing:
+            problems = [f"unknown: {', '.join(sorted(unknown))}"] if unknown else []
+            problems += [f"missing: {', '.join(sorted(missing))}"] if missing else []
+            raise RPCError(INVALID_PARAMS, f"Invalid arguments for {tool.name} ({'; '.join(problems)})")
+        if owner_id is None:
+            raise RPCError(INVALID_REQUEST, "No user to act for; authenticate or start the server with --user")
+
+        self.calls += 1
+        # Each call gets its own scope: concurrent calls in a batch can't share a session
+        async with tool_scope(owner_id):
+            result = await tool.function(**arguments)
+        is_error = not result.get("success", False)
+        if is_error:
+            self.errors += 1
+        # One encode gives both the text content and plain-JSON structured content
+        result_text = dumps(result)
+        return {
+            "content": [{"type": "text", "text": result_text}],
+            "structuredContent": json.loads(result_text),
+            "isError": is_error,
+        }
+
+    @staticmethod
+    def _error(request_id: Any, code: int, message: str) -> Dict[str, Any]:
+        return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+async def serve_stdio(server: MCPServer) -> None:
+    """Newline-delimited JSON-RPC over stdin/stdout"""
+    # Protocol messages own stdout; stray prints from anywhere else go to stderr
+    out = sys.stdout.buffer
+    sys.stdout = sys.stderr
+
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=16 * 1024 * 1024)
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+    def write(response: Any) -> None:
+        out.write(dumps(response).encode() + b"\n")
+        out.flush()
+
+    async def respond(message: Any) -> None:
+        response = await server.handle(message)
+        if response is not None:
+            write(response)
+
+    pending = set()
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        if not line.strip():
+            continue
+        try:
+            message = json.loads(line)
+        except ValueError:
+            write(MCPServer._error(None, PARSE_ERROR, "Parse error"))
+            continue
+        # Each request runs in its own task so slow tool calls don't block others
+        task = asyncio.create_task(respond(message))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+def create_http_app(server: MCPServer):
+    """FastAPI app serving the streamable HTTP transport at POST /mcp"""
+    from fastapi import FastAPI, Request, Response
+
+    from app.core.auth import authenticate_token
+    from app.utils.exceptions import InvalidTokenException
+
+    app = FastAPI(title="Todo MCP server")
+
+    async def request_owner(request: Request) -> Optional[UUID]:
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if not token or scheme.lower() != "bearer":
+            return None
+        async with AsyncSession(bind=engine) as session:
+            user = await authenticate_token(token, session)
+        if not user.is_active:
+            raise InvalidTokenException("Account is deactivated")
+        return user.id
+
+    @app.on_event("startup")
+    async def startup() -> None:
+        await server.warm_up()
+
+    @app.on_event("shutdown")
+    async def shutdown() -> None:
+        await server.close()
+
+    @app.post("/mcp")
+    async def mcp_endpoint(request: Request) -> Response:
+        started = time.perf_counter()
+        try:
+            owner_id = await request_owner(request)
+        except InvalidTokenException as e:
+            return Response(dumps({"detail": e.message}), status_code=401, media_type="application/json",
+                            headers={"WWW-Authenticate": "Bearer"})
+        try:
+            message = json.loads(await request.body())
+        except ValueError:
+            return Response(dumps(MCPServer._error(None, PARSE_ERROR, "Parse error")),
+                            status_code=400, media_type="application/json")
+        response = await server.handle(message, owner_id)
+        if response is None:
+            # Only notifications or responses were sent
+            return Response(status_code=202)
+        return Response(
+            dumps(response),
+            media_type="application/json",
+            headers={"Server-Timing": f"mcp;dur={(time.perf_counter() - started) * 1000:.2f}"},
+        )
+
+    @app.get("/mcp")
+    async def no_server_stream() -> Response:
+        # This server never initiates messages, so there is no SSE stream to open
+        return Response(status_code=405, headers={"Allow": "POST"})
+
+    @app.get("/health")
+    async def health() -> Dict[str, Any]:
+        return {"status": "healthy", "tools": len(server.tools), "calls": server.calls, "errors": server.errors}
+
+    return app
+
+
+async def _run_stdio(user: Optional[str]) -> None:
+    if not user:
+        raise SystemExit("The stdio transport needs --user (or MCP_USER) to know whose tasks to serve")
+    try:
+        owner_id = await resolve_user(user)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    server = MCPServer(TOOLS, owner_id)
+    await server.warm_up()
+    try:
+        await serve_stdio(server)
+    finally:
+        await server.close()
+
+
+async def _resolve_default_user(user: str) -> UUID:
+    try:
+        return await resolve_user(user)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    finally:
+        # Pooled connections belong to this event loop, not uvicorn's
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the task tools over the Model Context Protocol")
+    parser.add_argument("--transport", choices=["stdio", "http"], default="stdio")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--user", default=os.environ.get("MCP_USER"),
+        help="id, email or username whose tasks the tools act on (HTTP: when no bearer token is sent)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+    if args.transport == "stdio":
+        asyncio.run(_run_stdio(args.user))
+    else:
+        import uvicorn
+
+        owner_id = asyncio.run(_resolve_default_user(args.user)) if args.user else None
+        uvicorn.run(create_http_app(MCPServer(TOOLS, owner_id)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
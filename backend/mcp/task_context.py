@@ -0,0 +1,281 @@
+import asyncio
+import heapq
+import json
+import logging
+import math
+import re
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.settings import settings
+from app.db.database import engine
+from app.repositories.task_repository import TaskRepository
+from app.schemas.task import TaskFilter
+from app.services.task_service import TaskService
+
+logger = logging.getLogger(__name__)
+
+# Lexical relevance ranking that keeps the prompt context bounded.
+# Each user's tasks live in an in-process BM25 index kept in sync incrementally:
+# the chat tools push their own writes into it, at most every
+# llm_context_refresh_seconds it pulls tasks updated since the last sync
+# (writes made through the REST API), and a full resync every
+# llm_context_resync_seconds drops tasks deleted elsewhere. Syncs run in the
+# background, so building a context never waits on the database.
+
+_TOKEN = re.compile(r"\w+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by do for from i in is it me my of on or please task tasks "
+    "that the this to what with you your".split()
+)
+
+# BM25 parameters; title terms count twice as much as description terms
+_K1 = 1.2
+_B = 0.75
+_TITLE_WEIGHT = 2
+
+# Recency bonus for a task updated just now, relative to a strong BM25 match
+_RECENCY_WEIGHT = 1.0
+
+# Rows updated in the same second as the watermark may not have been seen yet
+_SYNC_OVERLAP = timedelta(seconds=2)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercased word tokens without stopwords"""
+    if not text:
+        return []
+    return [token for token in _TOKEN.findall(text.lower()) if token not in _STOPWORDS]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count (about four characters per token)"""
+    return len(text) // 4 + 1
+
+
+@dataclass
+class _IndexedTask:
+    id: str
+    title: str
+    terms: Counter
+    length: int
+    updated_at: float
+
+
+class TaskIndex:
+    """Incrementally maintained BM25 index over task titles and descriptions"""
+
+    def __init__(self):
+        self._tasks: Dict[str, _IndexedTask] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def upsert(self, task_id: str, title: str, description: Optional[str], updated_at: datetime) -> None:
+        """Add a task or replace its indexed text"""
+        self.remove(task_id)
+        if updated_at.tzinfo is None:
+            # SQLite returns naive UTC timestamps
+            updated_at = updated_at.replace(tzinfo=timezone.utc)
+        terms = Counter(tokenize(description))
+        for term in tokenize(title):
+            terms[term] += _TITLE_WEIGHT
+        length = sum(terms.values())
+        self._tasks[task_id] = _IndexedTask(task_id, title, terms, length, updated_at.timestamp())
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[task_id] = frequency
+        self._total_length += length
+
+    def remove(self, task_id: str) -> None:
+        """Drop a task from the index if present"""
+        task = self._tasks.pop(task_id, None)
+        if task is None:
+            return
+        for term in task.terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(task_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= task.length
+
+    def retain(self, task_ids: Iterable[str]) -> None:
+        """Drop every task not in task_ids"""
+        keep = set(task_ids)
+        for task_id in [task_id for task_id in self._tasks if task_id not in keep]:
+            self.remove(task_id)
+
+    def rank(self, query: str, limit: int, half_life_seconds: float) -> List[str]:
+        """
+        Titles of the ``limit`` tasks most relevant to ``query``
+
+        Score = BM25(query, task) + a recency bonus halving every
+        ``half_life_seconds``. When few tasks match the query, the rest of
+        the slots go to the most recently updated tasks.
+        """
+        if not self._tasks or limit <= 0:
+            return []
+
+        now = time.time()
+        count = len(self._tasks)
+        average_length = self._total_length / count or 1.0
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for task_id, frequency in postings.items():
+                length = self._tasks[task_id].length
+                norm = frequency * (_K1 + 1) / (frequency + _K1 * (1 - _B + _B * length / average_length))
+                scores[task_id] = scores.get(task_id, 0.0) + idf * norm
+
+        def recency(task: _IndexedTask) -> float:
+            return _RECENCY_WEIGHT * 0.5 ** (max(0.0, now - task.updated_at) / half_life_seconds)
+
+        ranked = heapq.nlargest(
+            limit, scores, key=lambda task_id: scores[task_id] + recency(self._tasks[task_id])
+        )
+        if len(ranked) < limit:
+            seen = set(ranked)
+            recent = heapq.nlargest(
+                limit, (task for task in self._tasks.values() if task.id not in seen),
+                key=lambda task: task.updated_at,
+            )
+            ranked.extend(task.id for task in recent[:limit - len(ranked)])
+        return [self._tasks[task_id].title for task_id in ranked]
+
+
+class _UserContext:
+    """One user's task index and how far it has been synced"""
+
+    def __init__(self):
+        self.index = TaskIndex()
+        self.watermark: Optional[datetime] = None
+        self.last_full_sync = 0.0
+        self.last_sync: Optional[float] = None
+        self.lock = asyncio.Lock()
+
+
+class TaskContextBuilder:
+    """Builds the task context sent to the LLM within a token budget"""
+
+    def __init__(self, max_users: int = 1000):
+        # One index per user, so ranking only ever sees the caller's own tasks
+        self._users: "OrderedDict[UUID, _UserContext]" = OrderedDict()
+        self._max_users = max_users
+        # Background syncs in progress, at most one per user
+        self._refreshes: Dict[UUID, "asyncio.Task[None]"] = {}
+
+    def _user(self, owner_id: UUID) -> _UserContext:
+        user = self._users.get(owner_id)
+        if user is None:
+            user = self._users[owner_id] = _UserContext()
+            if len(self._users) > self._max_users:
+                self._users.popitem(last=False)
+        else:
+            self._users.move_to_end(owner_id)
+        return user
+
+    async def _fetch(self, owner_id: UUID, updated_since: Optional[datetime]):
+        async with AsyncSession(bind=engine) as session:
+            task_service = TaskService(TaskRepository(session, owner_id))
+            return await task_service.get_all_tasks(TaskFilter(updated_since=updated_since))
+
+    async def sync(self, owner_id: UUID) -> None:
+        """Pull the user's tasks changed since the last sync, or all of them when a full resync is due"""
+        user = self._user(owner_id)
+        async with user.lock:
+            now = time.monotonic()
+            full = user.last_sync is None or now - user.last_full_sync >= settings.llm_context_resync_seconds
+            if not full and now - user.last_sync < settings.llm_context_refresh_seconds:
+                return
+            updated_since = None if full or user.watermark is None else user.watermark - _SYNC_OVERLAP
+            tasks = await self._fetch(owner_id, updated_since)
+
+            for task in tasks:
+                user.index.upsert(str(task.id), task.title, task.description, task.updated_at)
+                if user.watermark is None or task.updated_at > user.watermark:
+                    user.watermark = task.updated_at
+            if full:
+                user.index.retain(str(task.id) for task in tasks)
+                user.last_full_sync = now
+            user.last_sync = now
+
+    def _sync_due(self, user: _UserContext) -> bool:
+        if user.last_sync is None:
+            return True
+        now = time.monotonic()
+        return (
+            now - user.last_sync >= settings.llm_context_refresh_seconds
+            or now - user.last_full_sync >= settings.llm_context_resync_seconds
+        )
+
+    def refresh(self, owner_id: UUID) -> None:
+        """Start a background sync of the user's index if one is due and none is running"""
+        if owner_id in self._refreshes or not self._sync_due(self._user(owner_id)):
+            return
+        refresh = asyncio.ensure_future(self._refresh(owner_id))
+        self._refreshes[owner_id] = refresh
+        refresh.add_done_callback(lambda _: self._refreshes.pop(owner_id, None))
+
+    async def _refresh(self, owner_id: UUID) -> None:
+        try:
+            await self.sync(owner_id)
+        except Exception:
+            # The next chat message retries; until then the index is a bit stale
+            logger.warning("Task context sync failed for user %s", owner_id, exc_info=True)
+
+    def note_changed(self, owner_id: UUID, task: Any) -> None:
+        """Index a task created or updated through the chat tools right away"""
+        user = self._users.get(owner_id)
+        # Users without an index yet pick the task up on their first sync
+        if user is not None:
+            user.index.upsert(str(task.id), task.title, task.description, task.updated_at)
+
+    def forget(self, owner_id: UUID, task_id: str) -> None:
+        """Drop a deleted task without waiting for the next full resync"""
+        user = self._users.get(owner_id)
+        if user is not None:
+            user.index.remove(str(task_id))
+
+    def build(self, owner_id: UUID, message: str) -> Optional[Dict[str, Any]]:
+        """
+        Context for a user's chat message: their most relevant task titles
+        that fit in settings.llm_context_max_tokens, plus their task count
+
+        Only the in-memory index is read; a sync that is due starts in the
+        background. None until the user's first sync has finished.
+        """
+        self.refresh(owner_id)
+        user = self._user(owner_id)
+        if user.last_sync is None:
+            return None
+        index = user.index
+        titles = index.rank(
+            message,
+            settings.llm_context_max_tasks,
+            settings.llm_context_recency_half_life_hours * 3600,
+        )
+
+        budget = settings.llm_context_max_tokens
+        available_tasks = []
+        for title in titles:
+            cost = estimate_tokens(json.dumps(title)) + 1
+            if cost > budget:
+                break
+            available_tasks.append(title)
+            budget -= cost
+
+        return {"available_tasks": available_tasks, "total_tasks": len(index)}
+
+
+task_context = TaskContextBuilder(max_users=settings.llm_context_max_users)
@@ -1,5 +1,5 @@
 from .add_task import add_task
-from .read_tasks import read_tasks, read_task_by_id
+from .read_tasks import read_tasks, read_task_by_id, find_task_by_title
 from .update_task import update_task
 from .delete_task import delete_task
 from .complete_task import complete_task
@@ -9,6 +9,7 @@ TOOLS = {
     "add_task": add_task,
     "read_tasks": read_tasks,
     "read_task_by_id": read_task_by_id,
+    "find_task_by_title": find_task_by_title,
     "update_task": update_task,
     "delete_task": delete_task,
     "complete_task": complete_task
@@ -18,6 +19,7 @@ __all__ = [
     "add_task",
     "read_tasks", 
     "read_task_by_id",
+    "find_task_by_title",
     "update_task",
     "delete_task",
     "complete_task",
@@ -6,11 +6,11 @@ sys.path.insert(0, backend_dir)
 
 from app.schemas.task import TaskCreate
 from app.services.task_service import TaskService
-from app.repositories.task_repository import TaskRepository
-from app.db.database import engine  # Use the existing engine from the app
-from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.task_cache import make_task_repository
+from .session import tool_session, tool_owner, invalidate_memoized
 from sqlalchemy.orm import sessionmaker
 from typing import Dict, Any
+from ..task_context import task_context
 
 async def add_task(title: str, description: str = "", priority: str = "medium") -> Dict[str, Any]:
     """
@@ -25,9 +25,9 @@ async def add_task(title: str, description: str = "", priority: str = "medium")
         A dictionary containing the created task or an error message
     """
     try:
-        # Use the existing database session from the app
-        async with AsyncSession(bind=engine) as session:
-            task_repo = TaskRepository(session)
+        # Share the chat request's session when called inside a tool_scope
+        async with tool_session() as session:
+            task_repo = make_task_repository(session, tool_owner())
             task_service = TaskService(task_repo)
 
             # Create the task
@@ -38,6 +38,8 @@ async def add_task(title: str, description: str = "", priority: str = "medium")
             )
 
             created_task = await task_service.create_task(task_create)
+            invalidate_memoized()
+            task_context.note_changed(task_repo.owner_id, created_task)
 
             return {
                 "success": True,
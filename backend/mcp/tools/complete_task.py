@@ -4,12 +4,11 @@ import os
 backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, backend_dir)
 
-from app.schemas.task import TaskUpdate
 from app.services.task_service import TaskService
-from app.repositories.task_repository import TaskRepository
-from app.db.database import engine
-from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.task_cache import make_task_repository
+from .session import tool_session, tool_owner, invalidate_memoized
 from typing import Dict, Any
+from ..task_context import task_context
 
 async def complete_task(task_id: str) -> Dict[str, Any]:
     """
@@ -22,27 +21,17 @@ async def complete_task(task_id: str) -> Dict[str, Any]:
         A dictionary containing the updated task or an error message
     """
     try:
-        # Use the existing database session from the app
-        async with AsyncSession(bind=engine) as session:
-            task_repo = TaskRepository(session)
+        # Share the chat request's session when called inside a tool_scope
+        async with tool_session() as session:
+            task_repo = make_task_repository(session, tool_owner())
             task_service = TaskService(task_repo)
 
-            # First, get the current task to check its completion status
-            current_task = await task_service.get_task_by_id(task_id)
-            if not current_task:
-                return {
-                    "success": False,
-                    "error": f"Task with ID {task_id} not found"
-                }
-
-            # Toggle the completion status
-            new_completed_status = not current_task.completed
-
-            # Update the task with the new completion status
-            task_update = TaskUpdate(completed=new_completed_status)
-            updated_task = await task_service.update_task(task_id, task_update)
+            # Flip the completion status in a single atomic UPDATE
+            updated_task = await task_service.toggle_task_completion(task_id)
 
             if updated_task:
+                invalidate_memoized()
+                task_context.note_changed(task_repo.owner_id, updated_task)
                 return {
                     "success": True,
                     "task": updated_task.dict(),
@@ -51,7 +40,7 @@ async def complete_task(task_id: str) -> Dict[str, Any]:
             else:
                 return {
                     "success": False,
-                    "error": f"Failed to update task with ID {task_id}"
+                    "error": f"Task with ID {task_id} not found"
                 }
 
     except Exception as e:
@@ -5,10 +5,10 @@ backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__
 sys.path.insert(0, backend_dir)
 
 from app.services.task_service import TaskService
-from app.repositories.task_repository import TaskRepository
-from app.db.database import engine
-from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.task_cache import make_task_repository
+from .session import tool_session, tool_owner, invalidate_memoized
 from typing import Dict, Any
+from ..task_context import task_context
 
 async def delete_task(task_id: str) -> Dict[str, Any]:
     """
@@ -21,14 +21,17 @@ async def delete_task(task_id: str) -> Dict[str, Any]:
         A dictionary containing success status or an error message
     """
     try:
-        # Use the existing database session from the app
-        async with AsyncSession(bind=engine) as session:
-            task_repo = TaskRepository(session)
+        # Share the chat request's session when called inside a tool_scope
+        async with tool_session() as session:
+            task_repo = make_task_repository(session, tool_owner())
             task_service = TaskService(task_repo)
 
             deleted = await task_service.delete_task(task_id)
 
             if deleted:
+                # Keep deleted tasks out of the LLM context right away
+                invalidate_memoized()
+                task_context.forget(task_repo.owner_id, task_id)
                 return {
                     "success": True,
                     "message": f"Task with ID {task_id} deleted successfully"
@@ -5,27 +5,40 @@ backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__
 sys.path.insert(0, backend_dir)
 
 from app.services.task_service import TaskService
-from app.repositories.task_repository import TaskRepository
-from app.db.database import engine
-from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.task_cache import make_task_repository
+from app.schemas.task import TaskFilter
+from .session import tool_session, tool_owner, memoized
 from sqlalchemy.orm import sessionmaker
 import asyncio
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
-async def read_tasks() -> Dict[str, Any]:
+# Titles offered back when a fuzzy title lookup is ambiguous
+MAX_TITLE_CANDIDATES = 5
+
+async def read_tasks(completed: Optional[bool] = None, priority: Optional[str] = None) -> Dict[str, Any]:
     """
     Read all tasks from the todo app
 
+    Args:
+        completed: Only return tasks with this completion status (optional)
+        priority: Only return tasks with this priority level (optional)
+
     Returns:
         A dictionary containing all tasks or an error message
     """
+    # Reads are memoized within a chat request's tool_scope
+    return await memoized(("read_tasks", completed, priority), lambda: _read_tasks(completed, priority))
+
+async def _read_tasks(completed: Optional[bool] = None, priority: Optional[str] = None) -> Dict[str, Any]:
     try:
-        # Use the existing database session from the app
-        async with AsyncSession(bind=engine) as session:
-            task_repo = TaskRepository(session)
+        # Share the chat request's session when called inside a tool_scope
+        async with tool_session() as session:
+            task_repo = make_task_repository(session, tool_owner())
             task_service = TaskService(task_repo)
 
-            tasks = await task_service.get_all_tasks()
+            # Filtering happens in SQL rather than on the returned list
+            filters = TaskFilter(completed=completed, priority=priority)
+            tasks = await task_service.get_all_tasks(filters)
 
             # Convert tasks to dictionaries
             task_dicts = [task.dict() for task in tasks]
@@ -54,10 +67,14 @@ async def read_task_by_id(task_id: str) -> Dict[str, Any]:
     Returns:
         A dictionary containing the task or an error message
     """
+    # Reads are memoized within a chat request's tool_scope
+    return await memoized(("read_task_by_id", str(task_id)), lambda: _read_task_by_id(task_id))
+
+async def _read_task_by_id(task_id: str) -> Dict[str, Any]:
     try:
-        # Use the existing database session from the app
-        async with AsyncSession(bind=engine) as session:
-            task_repo = TaskRepository(session)
+        # Share the chat request's session when called inside a tool_scope
+        async with tool_session() as session:
+            task_repo = make_task_repository(session, tool_owner())
             task_service = TaskService(task_repo)
 
             task = await task_service.get_task_by_id(task_id)
@@ -80,6 +97,58 @@ async def read_task_by_id(task_id: str) -> Dict[str, Any]:
             "error": str(e)
         }
 
+async def find_task_by_title(title: str, fuzzy: bool = False) -> Dict[str, Any]:
+    """
+    Find a task by its title (case-insensitive) with an indexed lookup
+
+    Args:
+        title: The title of the task to find
+        fuzzy: Fall back to full-text search when there is no exact match (optional);
+            a search hit is only used when it is the single match, otherwise
+            the matching titles are returned as "candidates"
+
+    Returns:
+        A dictionary containing the task or an error message
+    """
+    # Reads are memoized within a chat request's tool_scope
+    return await memoized(("find_task_by_title", title.lower(), fuzzy), lambda: _find_task_by_title(title, fuzzy))
+
+async def _find_task_by_title(title: str, fuzzy: bool = False) -> Dict[str, Any]:
+    try:
+        # Share the chat request's session when called inside a tool_scope
+        async with tool_session() as session:
+            task_repo = make_task_repository(session, tool_owner())
+            task_service = TaskService(task_repo)
+
+            task = await task_service.find_task_by_title(title, fuzzy=fuzzy)
+
+            if task:
+                return {
+                    "success": True,
+                    "task": task.dict(),
+                    "message": f"Found task '{task.title}'"
+                }
+
+            if fuzzy:
+                matches = await task_service.search_tasks(title, limit=MAX_TITLE_CANDIDATES)
+                if matches:
+                    return {
+                        "success": False,
+                        "error": f"Several tasks match '{title}'",
+                        "candidates": [match.title for match in matches]
+                    }
+
+            return {
+                "success": False,
+                "error": f"Task with title '{title}' not found"
+            }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
 if __name__ == "__main__":
     async def test_read_tasks():
         result = await read_tasks()
@@ -0,0 +1,110 @@
+import sys
+import os
+# Add the backend directory to the Python path to import backend functions
+backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, backend_dir)
+
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import engine
+
+
+class ToolScope:
+    """
+    Per-request state shared by tool calls
+
+    Holds the user whose tasks the tools act on, one AsyncSession, opened on
+    first use so requests that never touch tasks never check out a
+    connection, and memoized reads that are dropped whenever a tool writes.
+    """
+
+    def __init__(self, owner_id: UUID):
+        self.owner_id = owner_id
+        self._session: Optional[AsyncSession] = None
+        self._memo: Dict[Hashable, Any] = {}
+        self.queries = 0
+
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = AsyncSession(bind=engine)
+        return self._session
+
+    async def memoize(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        if key not in self._memo:
+            self.queries += 1
+            self._memo[key] = await load()
+        return self._memo[key]
+
+    def invalidate(self) -> None:
+        self._memo.clear()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+_current_scope: ContextVar[Optional[ToolScope]] = ContextVar("mcp_tool_scope", default=None)
+
+
+@asynccontextmanager
+async def tool_scope(owner_id: UUID) -> AsyncIterator[ToolScope]:
+    """Run the tool calls inside the block as owner_id, sharing one session and memoized reads"""
+    scope = _current_scope.get()
+    if scope is not None and scope.owner_id == owner_id:
+        yield scope
+        return
+
+    scope = ToolScope(owner_id)
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(token)
+        await scope.close()
+
+
+def tool_owner() -> UUID:
+    """The user the enclosing tool_scope acts for"""
+    scope = _current_scope.get()
+    if scope is None:
+        raise ValueError("Task tools must run inside a tool_scope for the user that owns the tasks")
+    return scope.owner_id
+
+
+@asynccontextmanager
+async def tool_session() -> AsyncIterator[AsyncSession]:
+    """The enclosing tool_scope's session, or a short-lived one outside of a scope"""
+    scope = _current_scope.get()
+    if scope is None:
+        async with AsyncSession(bind=engine) as session:
+            yield session
+        return
+
+    session = scope.session()
+    try:
+        yield session
+    except Exception:
+        # Leave the shared session usable for the next tool call
+        await session.rollback()
+        raise
+
+
+async def memoized(key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+    """Run a read once per tool_scope; outside of a scope it always runs"""
+    scope = _current_scope.get()
+    if scope is None:
+        return await load()
+    return await scope.memoize(key, load)
+
+
+def invalidate_memoized() -> None:
+    """Forget memoized reads after a tool has changed tasks"""
+    scope = _current_scope.get()
+    if scope is not None:
+        scope.invalidate()
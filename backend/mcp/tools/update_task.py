@@ -6,10 +6,10 @@ sys.path.insert(0, backend_dir)
 
 from app.schemas.task import TaskUpdate
 from app.services.task_service import TaskService
-from app.repositories.task_repository import TaskRepository
-from app.db.database import engine
-from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.task_cache import make_task_repository
+from .session import tool_session, tool_owner, invalidate_memoized
 from typing import Dict, Any, Optional
+from ..task_context import task_context
 
 async def update_task(task_id: str, title: Optional[str] = None, description: Optional[str] = None,
                       priority: Optional[str] = None, completed: Optional[bool] = None) -> Dict[str, Any]:
@@ -27,9 +27,9 @@ async def update_task(task_id: str, title: Optional[str] = None, description: Op
         A dictionary containing the updated task or an error message
     """
     try:
-        # Use the existing database session from the app
-        async with AsyncSession(bind=engine) as session:
-            task_repo = TaskRepository(session)
+        # Share the chat request's session when called inside a tool_scope
+        async with tool_session() as session:
+            task_repo = make_task_repository(session, tool_owner())
             task_service = TaskService(task_repo)
 
             # Prepare the update object with only the fields that are provided
@@ -48,6 +48,8 @@ async def update_task(task_id: str, title: Optional[str] = None, description: Op
             updated_task = await task_service.update_task(task_id, task_update)
 
             if updated_task:
+                invalidate_memoized()
+                task_context.note_changed(task_repo.owner_id, updated_task)
                 return {
                     "success": True,
                     "task": updated_task.dict(),
@@ -0,0 +1,65 @@
+import asyncio
+from mcp.resilience import CircuitBreaker, ResilientCaller
+from app.utils.exceptions import LLMUnavailableException
+
+
+def make_caller():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    caller = ResilientCaller(
+        max_concurrency=4,
+        queue_timeout=1.0,
+        call_timeout=1.0,
+        max_retries=0,
+        retry_base_delay=0.01,
+        breaker=breaker,
+    )
+    return caller, breaker
+
+
+async def fail():
+    raise asyncio.TimeoutError()
+
+
+async def hang():
+    await asyncio.sleep(10)
+
+
+async def answer():
+    return "ok"
+
+
+async def check_cancelled_probe_releases_half_open():
+    print("Testing that a cancelled half-open probe doesn't wedge the circuit...")
+    caller, breaker = make_caller()
+
+    # Open the circuit, then wait for the cool-down so the next call probes
+    try:
+        await caller.call(fail)
+    except LLMUnavailableException:
+        pass
+    assert breaker.state == "open", breaker.state
+    await asyncio.sleep(0.06)
+
+    # The probe is cancelled while in flight (e.g. the client disconnected)
+    probe = asyncio.create_task(caller.call(hang))
+    await asyncio.sleep(0.01)
+    assert breaker.state == "half_open", breaker.state
+    probe.cancel()
+    try:
+        await probe
+    except asyncio.CancelledError:
+        pass
+
+    # The next call must be allowed to probe, and its success closes the circuit
+    result = await caller.call(answer)
+    assert result == "ok", result
+    assert breaker.state == "closed", breaker.state
+    print("Cancelled probe released; circuit closed after the next call")
+
+
+def test_cancelled_probe_releases_half_open():
+    asyncio.run(check_cancelled_probe_releases_half_open())
+
+
+if __name__ == "__main__":
+    test_cancelled_probe_releases_half_open()
@@ -0,0 +1,106 @@
+import asyncio
+import time
+import uuid
+import httpx
+from app.main import app, startup_event, shutdown_event
+
+
+async def signed_in_client(client):
+    name = f"etag{uuid.uuid4().hex[:12]}"
+    credentials = {"email": f"{name}@example.com", "password": "password123"}
+    response = await client.post("/auth/signup", json={**credentials, "username": name})
+    assert response.status_code == 201, response.text
+    response = await client.post("/auth/signin", json=credentials)
+    client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+
+async def start_of_second():
+    # Leave the rest of the second for the writes that must share a timestamp
+    await asyncio.sleep(1 - time.time() % 1)
+
+
+async def check_task_list_etag():
+    print("Testing conditional requests on the task list...")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        await signed_in_client(client)
+        task_id = (await client.post("/api/v1/tasks", json={"title": "one"})).json()["id"]
+
+        response = await client.get("/api/v1/tasks")
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        assert response.headers["Cache-Control"] == "private, no-cache"
+
+        response = await client.get("/api/v1/tasks", headers={"If-None-Match": etag})
+        assert response.status_code == 304 and response.content == b""
+        assert response.headers["ETag"] == etag
+        # The ETag covers the query too
+        response = await client.get("/api/v1/tasks?limit=1", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+
+        # Edit, poll, edit again within the same second, poll: updated_at and
+        # the task count don't change, so only the task version tells them apart
+        await start_of_second()
+        first = await client.put(f"/api/v1/tasks/{task_id}", json={"title": "two"})
+        response = await client.get("/api/v1/tasks", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        second = await client.put(f"/api/v1/tasks/{task_id}", json={"title": "three"})
+        assert first.json()["updated_at"] == second.json()["updated_at"], "edits crossed a second"
+        response = await client.get("/api/v1/tasks", headers={"If-None-Match": etag})
+        assert response.status_code == 200, response.status_code
+        assert [task["title"] for task in response.json()] == ["three"]
+
+        # Deleting a task changes the version as well
+        etag = response.headers["ETag"]
+        await client.delete(f"/api/v1/tasks/{task_id}")
+        response = await client.get("/api/v1/tasks", headers={"If-None-Match": etag})
+        assert response.status_code == 200 and response.json() == []
+    print("Unchanged lists return 304; every write, even within one second, returns 200")
+
+
+async def check_task_detail_etag():
+    print("Testing conditional requests on a single task...")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        await signed_in_client(client)
+        task_id = (await client.post("/api/v1/tasks", json={"title": "one"})).json()["id"]
+        url = f"/api/v1/tasks/{task_id}"
+
+        response = await client.get(url)
+        etag, last_modified = response.headers["ETag"], response.headers["Last-Modified"]
+        assert (await client.get(url, headers={"If-None-Match": etag})).status_code == 304
+        assert (await client.get(url, headers={"If-None-Match": f'"other", W/{etag}'})).status_code == 304
+        assert (await client.get(url, headers={"If-Modified-Since": last_modified})).status_code == 304
+        old = "Mon, 01 Jan 2001 00:00:00 GMT"
+        assert (await client.get(url, headers={"If-Modified-Since": old})).status_code == 200
+        assert (await client.get(url, headers={"If-Modified-Since": "not a date"})).status_code == 200
+
+        # If-None-Match takes precedence: a stale ETag wins over a current date
+        headers = {"If-None-Match": '"stale"', "If-Modified-Since": last_modified}
+        assert (await client.get(url, headers=headers)).status_code == 200
+        headers = {"If-None-Match": etag, "If-Modified-Since": old}
+        assert (await client.get(url, headers=headers)).status_code == 304
+
+        # A change within the same second keeps Last-Modified but not the ETag
+        await start_of_second()
+        etag = (await client.get(url)).headers["ETag"]
+        await client.patch(f"{url}/complete")
+        response = await client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200 and response.json()["completed"] is True
+    print("Detail ETags are exact; If-Modified-Since only applies without If-None-Match")
+
+
+async def check_conditional_requests():
+    await startup_event()
+    try:
+        await check_task_list_etag()
+        await check_task_detail_etag()
+    finally:
+        await shutdown_event()
+
+
+def test_conditional_requests():
+    asyncio.run(check_conditional_requests())
+
+
+if __name__ == "__main__":
+    test_conditional_requests()
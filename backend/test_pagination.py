@@ -0,0 +1,80 @@
+import asyncio
+import os
+import tempfile
+from datetime import timedelta
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.db.database import Base
+from app.repositories.task_repository import TaskRepository
+from app.repositories.user_repository import UserRepository
+from app.schemas.task import TaskCreate, TaskFilter
+from app.schemas.user import UserCreate
+from app.services.task_service import TaskService
+
+
+async def make_service(session):
+    user = await UserRepository(session).create_user(
+        UserCreate(email="pager@example.com", username="pager", password="password123")
+    )
+    return TaskService(TaskRepository(session, user.id))
+
+
+async def page_through(service, sort):
+    pages, cursor = [], None
+    while True:
+        page = await service.get_tasks_page(3, cursor, sort=sort)
+        pages.append(page)
+        cursor = page.next_cursor
+        if cursor is None:
+            return pages
+        assert len(pages) < 7, f"cursor never ended for {sort}"
+
+
+async def check_same_second_pages_are_disjoint():
+    print("Testing keyset paging over tasks created in the same second...")
+    db_file = os.path.join(tempfile.mkdtemp(), "test_pagination.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_file}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with AsyncSessionLocal() as session:
+        service = await make_service(session)
+        # One INSERT, so every row gets the same server-side timestamp
+        created = await service.batch_create_tasks([TaskCreate(title=f"t{n}") for n in range(7)])
+        assert len({item.task.created_at for item in created.results}) == 1
+
+        for sort in ("-created_at", "created_at", "-updated_at", "updated_at"):
+            results = await page_through(service, sort)
+            pages = [[task.title for task in page.items] for page in results]
+            seen = [title for page in pages for title in page]
+            assert [len(page) for page in pages] == [3, 3, 1], (sort, pages)
+            assert len(set(seen)) == 7, (sort, pages)
+
+            # Walking back from the last page returns the page before it
+            back = await service.get_tasks_page(3, results[-1].prev_cursor, sort=sort)
+            assert [task.title for task in back.items] == pages[1], (sort, back.items)
+            print(f"{sort}: pages {pages}")
+
+        # The created_* filters compare against the stored timestamps exactly
+        created_at = created.results[0].task.created_at
+        for after, before, expected in (
+            (created_at - timedelta(seconds=1), None, 7),
+            (created_at, None, 0),
+            (None, created_at, 0),
+            (None, created_at + timedelta(seconds=1), 7),
+        ):
+            filters = TaskFilter(created_after=after, created_before=before)
+            page = await service.get_tasks_page(10, filters=filters)
+            assert len(page.items) == expected, (after, before, len(page.items))
+        print("Pages are disjoint, the cursor ends and the created_* filters are exact")
+
+    await engine.dispose()
+
+
+def test_same_second_pages_are_disjoint():
+    asyncio.run(check_same_second_pages_are_disjoint())
+
+
+if __name__ == "__main__":
+    test_same_second_pages_are_disjoint()
@@ -0,0 +1,105 @@
+import asyncio
+import os
+import tempfile
+from unittest.mock import patch
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.db.database import Base
+from app.repositories.task_cache import CachedTaskRepository, TaskReadCache
+from app.repositories.task_repository import TaskRepository
+from app.repositories.user_repository import UserRepository
+from app.schemas.task import TaskCreate, TaskUpdate
+from app.schemas.user import UserCreate
+
+
+async def make_database():
+    db_file = os.path.join(tempfile.mkdtemp(), "test_task_cache.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_file}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with AsyncSessionLocal() as session:
+        user = await UserRepository(session).create_user(
+            UserCreate(email="cache@example.com", username="cacher", password="password123")
+        )
+        task = await TaskRepository(session, user.id).create_task(TaskCreate(title="old"))
+    return engine, AsyncSessionLocal, user.id, task.id
+
+
+def slow_read(name):
+    """Patch a TaskRepository read to pause after querying, until released"""
+    queried, release = asyncio.Event(), asyncio.Event()
+    original = getattr(TaskRepository, name)
+
+    async def read(self, *args, **kwargs):
+        result = await original(self, *args, **kwargs)
+        queried.set()
+        await release.wait()
+        return result
+
+    return patch.object(TaskRepository, name, read), queried, release
+
+
+async def check_write_between_version_and_fill():
+    print("Testing a write that lands between the version read and the cache fill...")
+    engine, AsyncSessionLocal, owner_id, task_id = await make_database()
+    cache = TaskReadCache()
+
+    async with AsyncSessionLocal() as reader_session, AsyncSessionLocal() as writer_session:
+        reader = CachedTaskRepository(reader_session, owner_id, cache, "replica-a")
+        patcher, queried, release = slow_read("get_tasks_page")
+        with patcher:
+            read = asyncio.create_task(reader.get_tasks_page(10))
+            await queried.wait()
+            # Another replica's write, whose invalidation never reaches this one
+            await TaskRepository(writer_session, owner_id).update_task(task_id, TaskUpdate(title="new"))
+            release.set()
+            assert [task.title for task in await read] == ["old"]
+        # Nothing invalidated the fill, so the pre-write page is cached...
+        assert cache.stats()["entries"] == 1 and cache.stale_fills == 0
+
+    # ...but only under the version it was read at, which no later request sees
+    async with AsyncSessionLocal() as session:
+        page = await CachedTaskRepository(session, owner_id, cache, "replica-a").get_tasks_page(10)
+        assert [task.title for task in page] == ["new"], page
+    await engine.dispose()
+    print("The stale page stayed under the old version; the next request read the write")
+
+
+async def check_invalidation_during_slow_read():
+    print("Testing an invalidation that arrives while a read is in flight...")
+    engine, AsyncSessionLocal, owner_id, task_id = await make_database()
+    cache = TaskReadCache()
+
+    async with AsyncSessionLocal() as reader_session, AsyncSessionLocal() as writer_session:
+        reader = CachedTaskRepository(reader_session, owner_id, cache, "replica-a")
+        patcher, queried, release = slow_read("get_task_by_id")
+        with patcher:
+            read = asyncio.create_task(reader.get_task_by_id(task_id))
+            await queried.wait()
+            writer = CachedTaskRepository(writer_session, owner_id, cache, "replica-a")
+            await writer.update_task(task_id, TaskUpdate(title="new"))
+            release.set()
+            assert (await read).title == "old"
+        # Task reads aren't keyed by version, so only dropping the fill keeps it out
+        assert cache.stale_fills == 1 and cache.stats()["entries"] == 0
+
+    async with AsyncSessionLocal() as session:
+        task = await CachedTaskRepository(session, owner_id, cache, "replica-a").get_task_by_id(task_id)
+        assert task.title == "new", task
+    await engine.dispose()
+    print("The in-flight read was not cached; the next read saw the write")
+
+
+def test_write_between_version_and_fill():
+    asyncio.run(check_write_between_version_and_fill())
+
+
+def test_invalidation_during_slow_read():
+    asyncio.run(check_invalidation_during_slow_read())
+
+
+if __name__ == "__main__":
+    test_write_between_version_and_fill()
+    test_invalidation_during_slow_read()
@@ -1,6 +1,7 @@
 'use client';
 
 import React, { useState, useRef, useEffect } from 'react';
+import { authHeaders } from '@/lib/api';
 
 interface Message {
   id: string;
@@ -53,6 +54,7 @@ const ChatWindow = ({ onClose }: { onClose: () => void }) => {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
+          ...authHeaders(),
         },
         body: JSON.stringify({ message: inputValue }),
       });
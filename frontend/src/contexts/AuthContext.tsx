@@ -77,9 +77,8 @@ export const AuthProvider = ({ children }: { children: ReactNode }) => {
         throw new Error(errorData.detail || 'Sign up failed');
       }
 
-      const userData = await response.json();
-      setUser(userData);
-      localStorage.setItem('user', JSON.stringify(userData)); // Store user in localStorage
+      // Sign in right away; the access token is only issued at signin
+      await signIn(email, password);
     } catch (error: any) {
       throw new Error(error.message || 'Sign up failed');
     }
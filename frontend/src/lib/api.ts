@@ -2,16 +2,31 @@ import { Task } from '@/models/task';
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_BASE_URL || 'https://huzaifa5-todo.hf.space';
 
+// Largest page the task list endpoint serves
+const TASK_PAGE_SIZE = 200;
+
+// Upper bound on pages fetched for one task list, in case the cursor never ends
+const MAX_TASK_PAGES = 50;
+
+// Bearer token of the signed-in user; tasks are only served to their owner
+export const authHeaders = (): Record<string, string> => {
+  if (typeof window === 'undefined') return {};
+  const storedUser = localStorage.getItem('user');
+  const token = storedUser ? JSON.parse(storedUser).access_token : null;
+  return token ? { Authorization: `Bearer ${token}` } : {};
+};
+
 // Generic API call function with error handling
 const apiCall = async (endpoint: string, options: RequestInit = {}) => {
   const url = `${API_BASE_URL}${endpoint}`;
 
   const config: RequestInit = {
+    ...options,
     headers: {
       'Content-Type': 'application/json',
+      ...authHeaders(),
       ...options.headers,
     },
-    ...options,
   };
 
   try {
@@ -31,9 +46,50 @@ const apiCall = async (endpoint: string, options: RequestInit = {}) => {
 
 // Task API functions
 export const taskApi = {
-  // Get all tasks
+  // Get all tasks, following the pagination cursor until the last page
   getTasks: async () => {
-    return apiCall('/api/v1/tasks');
+    const tasks: Task[] = [];
+    const seenCursors = new Set<string>();
+    let cursor: string | null = null;
+    let pageTasks: Task[] = [];
+
+    for (let page = 0; page < MAX_TASK_PAGES; page++) {
+      const query = new URLSearchParams({ limit: String(TASK_PAGE_SIZE) });
+      if (cursor) query.set('cursor', cursor);
+      const url = `${API_BASE_URL}/api/v1/tasks?${query}`;
+
+      try {
+        const response = await fetch(url, {
+          headers: {
+            'Content-Type': 'application/json',
+            ...authHeaders(),
+          },
+        });
+
+        if (!response.ok) {
+          const errorData = await response.json().catch(() => ({}));
+          throw new Error(errorData.message || `HTTP error! status: ${response.status}`);
+        }
+
+        pageTasks = await response.json();
+        tasks.push(...pageTasks);
+        cursor = response.headers.get('X-Next-Cursor');
+      } catch (error) {
+        console.error(`API call failed: ${url}`, error);
+        throw error;
+      }
+
+      if (!cursor) return tasks;
+      // An empty page or a cursor we already followed would loop forever
+      if (pageTasks.length === 0 || seenCursors.has(cursor)) {
+        console.warn('Stopped paging tasks: the server returned a cursor that does not advance');
+        return tasks;
+      }
+      seenCursors.add(cursor);
+    }
+
+    console.warn(`Stopped paging tasks after ${MAX_TASK_PAGES} pages`);
+    return tasks;
   },
 
   // Get a specific task by ID
@@ -80,6 +136,7 @@ export const taskApi = {
       method: 'DELETE',
       headers: {
         'Content-Type': 'application/json',
+        ...authHeaders(),
       },
     };
 